@@ -17,7 +17,7 @@ Referencia:
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Callable, Optional
+from typing import Dict, List, Callable
 from dataclasses import dataclass
 import logging
 
@@ -14,7 +14,7 @@ Referencia: SAT Competition rules (satcompetition.github.io)
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 import logging
 
 logger = logging.getLogger(__name__)
@@ -140,14 +140,10 @@ class BenchmarkMetrics:
         Estándar en SAT Competition. k=2 es el más usado, k=10 más estricto.
         """
         penalty = k * self.timeout
-        
-        def penalized_time(row):
-            if row.get('result') in self.SOLVED_RESULTS and pd.notna(row.get('wall_time_seconds')):
-                return row['wall_time_seconds']
-            return penalty
-        
-        times = solver_df.apply(penalized_time, axis=1)
-        return float(times.mean())
+        wall = solver_df['wall_time_seconds'].astype(float).to_numpy()
+        solved = solver_df['result'].isin(list(self.SOLVED_RESULTS)).to_numpy() & ~np.isnan(wall)
+        times = np.where(solved, wall, penalty)
+        return float(times.mean()) if len(times) else float('nan')
     
     def _compute_par_scores(self, df: pd.DataFrame) -> Dict:
         """PAR-2 y PAR-10 para todos los solvers con ranking."""
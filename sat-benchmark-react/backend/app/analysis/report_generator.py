@@ -13,10 +13,8 @@ Genera informes completos en HTML y PDF con:
 El informe sigue la estructura de publicaciones en SAT Competition.
 """
 
-import os
-import json
 import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 import logging
 
 logger = logging.getLogger(__name__)
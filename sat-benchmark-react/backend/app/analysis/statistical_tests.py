@@ -33,10 +33,9 @@ Referencias:
 import numpy as np
 import pandas as pd
 from scipy import stats as scipy_stats
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 import logging
-import warnings
 
 logger = logging.getLogger(__name__)
 
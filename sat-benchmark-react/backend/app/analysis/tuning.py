@@ -1,12 +1,9 @@
-import os
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any
 
-import numpy as np
-from ConfigSpace import Configuration, ConfigurationSpace, Float, Integer, Categorical
+from ConfigSpace import Configuration, ConfigurationSpace, Integer, Categorical
 from smac import Scenario
 from smac.facade.algorithm_configuration_facade import AlgorithmConfigurationFacade
-from smac.runhistory.dataclasses import TrialValue, TrialInfo
 
 from app.solvers.registry import solver_registry
 
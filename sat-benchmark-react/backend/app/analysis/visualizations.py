@@ -52,6 +52,9 @@ def _ensure_seaborn():
     return _sns
 
 
+# Por encima de este número de celdas el heatmap no anota valores
+HEATMAP_ANNOT_MAX_CELLS = 500
+
 # Color palette for solvers (up to 8)
 SOLVER_COLORS = [
     "#2563EB",  # Blue - Kissat
@@ -104,9 +107,12 @@ class SATVisualizationEngine:
         self.figsize = figsize
         self.dpi = dpi
         self.style = style
+        self._style_applied = False
     
     def _apply_style(self):
-        """Apply publication-ready style."""
+        """Apply publication-ready style (once; rcParams are process-global)."""
+        if self._style_applied:
+            return
         plt = _ensure_matplotlib()
         try:
             plt.style.use(self.style)
@@ -126,6 +132,7 @@ class SATVisualizationEngine:
             'savefig.dpi': self.dpi,
             'font.family': 'sans-serif',
         })
+        self._style_applied = True
     
     # ==================== CACTUS PLOT ====================
     
@@ -248,12 +255,15 @@ class SATVisualizationEngine:
         
         fig, ax = plt.subplots(figsize=self.figsize)
         
-        # Prepare data
-        data_list = []
-        for solver, times in solver_times.items():
-            for t in times:
-                data_list.append({"Solver": solver, "Time": t})
-        df = pd.DataFrame(data_list)
+        # Prepare data: columnas construidas directamente (sin un dict por punto)
+        names = list(solver_times.keys())
+        lengths = [len(solver_times[s]) for s in names]
+        df = pd.DataFrame({
+            "Solver": np.repeat(names, lengths),
+            "Time": np.concatenate(
+                [np.asarray(solver_times[s], dtype=float) for s in names] or [np.empty(0)]
+            ),
+        })
         
         if df.empty:
             ax.text(0.5, 0.5, "No data available", ha='center', va='center',
@@ -295,6 +305,8 @@ class SATVisualizationEngine:
         Heatmap de rendimiento (solver × familia/categoría).
         
         Colores más oscuros = más lento (peor).
+        Con más de HEATMAP_ANNOT_MAX_CELLS celdas se omiten las anotaciones
+        y las líneas de separación (un Text/línea por celda en matplotlib).
         """
         plt = _ensure_matplotlib()
         sns = _ensure_seaborn()
@@ -304,8 +316,9 @@ class SATVisualizationEngine:
         w = max(8, matrix.shape[1] * 1.5)
         fig, ax = plt.subplots(figsize=(w, h))
         
-        sns.heatmap(matrix, annot=annot, fmt=fmt, cmap=cmap, ax=ax,
-                    linewidths=0.5, linecolor='white',
+        small = matrix.size <= HEATMAP_ANNOT_MAX_CELLS
+        sns.heatmap(matrix, annot=annot and small, fmt=fmt, cmap=cmap, ax=ax,
+                    linewidths=0.5 if small else 0, linecolor='white',
                     cbar_kws={'label': 'Time (seconds)'})
         
         ax.set_title(title)
@@ -6,19 +6,18 @@ Uses local Ollama or configurable AI providers to:
 3. Provide explanations about SAT/UNSAT results
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Literal
 from pathlib import Path
 from datetime import datetime
-import subprocess
 import httpx
-import json
 import re
 import logging
-import asyncio
 import os
 
+from .benchmarks import parse_cnf_header
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -461,21 +460,10 @@ async def list_generated_files() -> List[Dict]:
     if CNF_OUTPUT_DIR.exists():
         for f in CNF_OUTPUT_DIR.glob("*.cnf"):
             stat = f.stat()
-            # Parse header to get variables and clauses
-            try:
-                with open(f, 'r') as cnf_file:
-                    for line in cnf_file:
-                        if line.startswith('p cnf'):
-                            parts = line.split()
-                            num_vars = int(parts[2])
-                            num_clauses = int(parts[3])
-                            break
-                    else:
-                        num_vars = None
-                        num_clauses = None
-            except:
-                num_vars = None
-                num_clauses = None
+            # Cabecera leída en binario por bloques (sin decodificar línea a línea)
+            header = parse_cnf_header(str(f))
+            num_vars = header['num_variables']
+            num_clauses = header['num_clauses']
             
             files.append({
                 "name": f.name,
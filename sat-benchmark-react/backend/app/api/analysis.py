@@ -3,12 +3,15 @@ Analysis API endpoints
 Statistical analysis and visualization data
 """
 
-from fastapi import APIRouter, Depends, Request, HTTPException, Query
+from fastapi import APIRouter, Request, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional, List, Dict
 import pandas as pd
 import numpy as np
 import logging
+import json
+
+from app.core.utils import parse_id_ranges
 
 logger = logging.getLogger(__name__)
 
@@ -25,51 +28,198 @@ class AnalysisRequest(BaseModel):
 
 # ==================== HELPER FUNCTIONS ====================
 
-def calculate_par2(runs: List[Dict], timeout: float = 5000.0) -> Dict:
-    """Calculate PAR-2 scores for each solver"""
-    if not runs:
-        return {}
-    
+# Columnas de baja cardinalidad: como category las comparaciones, isin y
+# groupby trabajan sobre códigos enteros en vez de hashear strings
+CATEGORICAL_RUN_COLUMNS = ('solver_name', 'benchmark_family', 'result')
+
+
+def runs_to_dataframe(runs: List[Dict]) -> pd.DataFrame:
+    """Build the runs DataFrame with low-cardinality columns as categoricals"""
     df = pd.DataFrame(runs)
+    for col in CATEGORICAL_RUN_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def _unique_families(df: pd.DataFrame) -> List[Optional[str]]:
+    """Families in order of appearance; a NULL family stays None (not NaN) for JSON"""
+    families = df['benchmark_family'].unique()
+    return [None if pd.isna(f) else f for f in families]
+
+
+PAR2_PENALIZED_RESULTS = ['TIMEOUT', 'MEMOUT', 'ERROR', 'UNKNOWN']
+
+
+def par2_times(df: pd.DataFrame, timeout: float) -> pd.Series:
+    """PAR-2 time per run, vectorized: 2*timeout if unsolved or without time"""
+    wall = df['wall_time_seconds'].astype(float)
+    penalized = wall.isna().to_numpy() | df['result'].isin(PAR2_PENALIZED_RESULTS).to_numpy()
+    return pd.Series(np.where(penalized, 2 * timeout, wall.to_numpy()), index=df.index)
+
+
+def _as_runs_frame(runs) -> pd.DataFrame:
+    """Accept either the runs list or an already built runs DataFrame (no rebuild)"""
+    return runs if isinstance(runs, pd.DataFrame) else runs_to_dataframe(runs)
+
+
+def calculate_par2(runs, timeout: float = 5000.0) -> Dict:
+    """Calculate PAR-2 scores for each solver (runs list or runs DataFrame)"""
+    if len(runs) == 0:
+        return {}
     
-    def par2_time(row):
-        if pd.isna(row.get('wall_time_seconds')):
-            return 2 * timeout
-        if row.get('result') in ['TIMEOUT', 'MEMOUT', 'ERROR', 'UNKNOWN']:
-            return 2 * timeout
-        return row['wall_time_seconds']
-    
-    df['par2_time'] = df.apply(par2_time, axis=1)
+    df = _as_runs_frame(runs)
     
-    par2_scores = df.groupby('solver_name')['par2_time'].mean().to_dict()
+    # Sin añadir columnas: el frame puede ser compartido con otros cálculos
+    par2 = par2_times(df, timeout)
+    par2_scores = par2.groupby(df['solver_name'], observed=True).mean().to_dict()
     return {k: round(v, 2) for k, v in par2_scores.items()}
 
 
-def calculate_solved_counts(runs: List[Dict]) -> Dict:
-    """Count solved instances per solver"""
-    if not runs:
+def calculate_solved_counts(runs) -> Dict:
+    """Count solved instances per solver (runs list or runs DataFrame)"""
+    if len(runs) == 0:
         return {}
     
-    df = pd.DataFrame(runs)
+    df = _as_runs_frame(runs)
+    
+    # Una sola pasada: tabla solver × resultado en lugar de una máscara por solver
+    totals = df.groupby('solver_name', observed=True).size()
+    counts = pd.crosstab(df['solver_name'], df['result'])
+    # crosstab omite los solvers cuyos runs tienen todos result NULL: se rellenan con 0
+    counts = counts.reindex(
+        index=totals.index,
+        columns=counts.columns.astype(object).union(['SAT', 'UNSAT', 'TIMEOUT', 'ERROR', 'UNKNOWN', 'MEMOUT']),
+        fill_value=0
+    )
+    summary = pd.DataFrame({
+        'total': totals,
+        'sat': counts['SAT'],
+        'unsat': counts['UNSAT'],
+        'timeout': counts['TIMEOUT'],
+        'error': counts[['ERROR', 'UNKNOWN', 'MEMOUT']].sum(axis=1),
+    })
+    summary['solved'] = summary['sat'] + summary['unsat']
     
     result = {}
     for solver in df['solver_name'].unique():
-        solver_df = df[df['solver_name'] == solver]
-        result[solver] = {
-            'total': len(solver_df),
-            'sat': len(solver_df[solver_df['result'] == 'SAT']),
-            'unsat': len(solver_df[solver_df['result'] == 'UNSAT']),
-            'timeout': len(solver_df[solver_df['result'] == 'TIMEOUT']),
-            'error': len(solver_df[solver_df['result'].isin(['ERROR', 'UNKNOWN', 'MEMOUT'])]),
-            'solved': len(solver_df[solver_df['result'].isin(['SAT', 'UNSAT'])])
-        }
-        result[solver]['solved_pct'] = round(
-            result[solver]['solved'] / result[solver]['total'] * 100, 2
-        ) if result[solver]['total'] > 0 else 0
+        row = {k: int(v) for k, v in summary.loc[solver].items()}
+        row['solved_pct'] = round(
+            row['solved'] / row['total'] * 100, 2
+        ) if row['total'] > 0 else 0
+        result[solver] = row
     
     return result
 
 
+def _top_benchmarks(df: pd.DataFrame, k: int, timed_only: bool = False) -> List[str]:
+    """
+    The k benchmarks with most runs, selected in one pass. timed_only ranks by
+    runs with a wall time instead (what /heatmap has always used).
+    """
+    if timed_only:
+        counts = df.groupby('benchmark_name')['wall_time_seconds'].count()
+        return counts.nlargest(k).index.tolist()
+    return df['benchmark_name'].value_counts().head(k).index.tolist()
+
+
+def _csv_page_writer():
+    """
+    Pick the CSV writer once per export, so every page has the same format.
+    
+    pandas by default (byte-compatible with the old df.to_csv export). With
+    EXPORT_CSV_USE_ARROW, pyarrow's C++ writer (quoting_style="needed", which
+    in pyarrow still quotes every string field) with the schema fixed by the
+    first page.
+    """
+    from app.core.config import settings
+    
+    pa = None
+    if settings.EXPORT_CSV_USE_ARROW:
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+        except ImportError:
+            logger.warning("EXPORT_CSV_USE_ARROW is set but pyarrow is not installed; using pandas")
+    
+    if pa is None:
+        def write_pandas(df: pd.DataFrame, header: bool) -> bytes:
+            return df.to_csv(index=False, header=header).encode('utf-8')
+        return write_pandas
+    
+    schema = None
+    options = {True: pacsv.WriteOptions(include_header=True, quoting_style='needed'),
+               False: pacsv.WriteOptions(include_header=False, quoting_style='needed')}
+    
+    def write_arrow(df: pd.DataFrame, header: bool) -> bytes:
+        nonlocal schema
+        # Columnas object (tipos mezclados, dicts): a texto para que la conversión no falle
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].map(lambda v: v if v is None or isinstance(v, str)
+                                  else json.dumps(v) if isinstance(v, (dict, list)) else str(v))
+        table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+        schema = schema or table.schema
+        buf = pa.BufferOutputStream()
+        pacsv.write_csv(table, buf, options[header])
+        return buf.getvalue().to_pybytes()
+    return write_arrow
+
+
+EXPORT_PAGE_SIZE = 5000
+
+
+def _iter_runs_csv(db, experiment_id: int, first_page: List[Dict]):
+    """
+    CSV chunks page by page (keyset on run id): memory stays bounded by one
+    page, and runs inserted during the export (a running experiment) are
+    neither skipped nor duplicated.
+    """
+    write_page = _csv_page_writer()
+    page, header, columns = first_page, True, None
+    while page:
+        df = pd.DataFrame(page)
+        if columns is None:
+            columns = list(df.columns)
+        else:
+            df = df.reindex(columns=columns)
+        yield write_page(df, header)
+        header = False
+        
+        if len(page) < EXPORT_PAGE_SIZE:
+            break
+        page = db.get_runs(experiment_id=experiment_id, limit=EXPORT_PAGE_SIZE,
+                           after_id=page[-1]['id'])
+
+
+def _sorted_solved_times(df: pd.DataFrame) -> Dict[str, List[float]]:
+    """Tiempos ordenados de instancias resueltas por solver (un sort + un groupby)"""
+    solved = df.loc[df['result'].isin(['SAT', 'UNSAT']), ['solver_name', 'wall_time_seconds']]
+    solved = solved.dropna(subset=['wall_time_seconds']).sort_values('wall_time_seconds', kind='stable')
+    return solved.groupby('solver_name', observed=True)['wall_time_seconds'].agg(list).to_dict()
+
+
+def _family_solver_stats(df: pd.DataFrame, timeout: Optional[float] = None) -> pd.DataFrame:
+    """
+    Per (family, solver) totals in one groupby instead of a boolean mask per
+    family and per solver. Rows follow first appearance (same order as the
+    nested unique() loops); with timeout, also the mean PAR-2 time.
+    """
+    solved = df['result'].isin(['SAT', 'UNSAT']).to_numpy()
+    frame = pd.DataFrame({
+        'family': df['benchmark_family'],
+        'solver': df['solver_name'],
+        'solved': solved,
+        'solved_time': df['wall_time_seconds'].astype(float).where(solved),
+        'pos': np.arange(len(df)),
+    })
+    aggs = dict(total=('pos', 'size'), solved=('solved', 'sum'),
+                avg_time=('solved_time', 'mean'), first=('pos', 'min'))
+    if timeout is not None:
+        frame['par2'] = par2_times(df, timeout)
+        aggs['par2'] = ('par2', 'mean')
+    return frame.groupby(['family', 'solver'], observed=True, sort=False).agg(**aggs).sort_values('first')
+
+
 # ==================== ENDPOINTS ====================
 
 @router.get("/summary")
@@ -93,10 +243,12 @@ async def get_analysis_summary(
             "total_runs": 0
         }
     
+    # Un solo DataFrame para ambos cálculos
+    df = runs_to_dataframe(runs)
     return {
         "total_runs": len(runs),
-        "par2_scores": calculate_par2(runs),
-        "solved_counts": calculate_solved_counts(runs),
+        "par2_scores": calculate_par2(df),
+        "solved_counts": calculate_solved_counts(df),
         "solvers": list(set(r['solver_name'] for r in runs)),
         "families": list(set(r.get('benchmark_family', 'unknown') for r in runs))
     }
@@ -119,31 +271,35 @@ async def get_par2_analysis(
     if not runs:
         return {"rankings": [], "timeout": timeout}
     
-    df = pd.DataFrame(runs)
-    
-    def par2_time(row):
-        if pd.isna(row.get('wall_time_seconds')):
-            return 2 * timeout
-        if row.get('result') in ['TIMEOUT', 'MEMOUT', 'ERROR', 'UNKNOWN']:
-            return 2 * timeout
-        return row['wall_time_seconds']
-    
-    df['par2_time'] = df.apply(par2_time, axis=1)
+    df = runs_to_dataframe(runs)
+    
+    df['par2_time'] = par2_times(df, timeout)
+    
+    # Agregados por solver en un solo groupby
+    is_solved = df['result'].isin(['SAT', 'UNSAT'])
+    per_solver = df.assign(
+        solved=is_solved,
+        timeout=df['result'] == 'TIMEOUT',
+        solved_time=df['wall_time_seconds'].where(is_solved)
+    ).groupby('solver_name', observed=True).agg(
+        par2_score=('par2_time', 'mean'),
+        solved=('solved', 'sum'),
+        total=('par2_time', 'size'),
+        timeouts=('timeout', 'sum'),
+        avg_time=('solved_time', 'mean')
+    )
     
     rankings = []
     for solver in df['solver_name'].unique():
-        solver_df = df[df['solver_name'] == solver]
-        solved = solver_df[solver_df['result'].isin(['SAT', 'UNSAT'])]
-        timeouts = solver_df[solver_df['result'] == 'TIMEOUT']
-        
-        avg_time = solved['wall_time_seconds'].mean() if len(solved) > 0 else 0
+        row = per_solver.loc[solver]
+        avg_time = row['avg_time'] if row['solved'] > 0 else 0
         
         rankings.append({
             'solver_name': solver,
-            'par2_score': round(solver_df['par2_time'].mean(), 2),
-            'solved': len(solved),
-            'total': len(solver_df),
-            'timeouts': len(timeouts),
+            'par2_score': round(row['par2_score'], 2),
+            'solved': int(row['solved']),
+            'total': int(row['total']),
+            'timeouts': int(row['timeouts']),
             'avg_time': round(avg_time, 3) if pd.notna(avg_time) else 0
         })
     
@@ -174,7 +330,7 @@ async def get_virtual_best_solver(
     if not runs:
         return {"message": "No runs found"}
     
-    df = pd.DataFrame(runs)
+    df = runs_to_dataframe(runs)
     
     # Filter only solved instances
     solved_df = df[df['result'].isin(['SAT', 'UNSAT'])]
@@ -184,7 +340,8 @@ async def get_virtual_best_solver(
         index='benchmark_name',
         columns='solver_name',
         values='wall_time_seconds',
-        aggfunc='first'
+        aggfunc='first',
+        observed=True
     ).fillna(2 * timeout)  # Penalty for unsolved
     
     if pivot.empty:
@@ -199,7 +356,7 @@ async def get_virtual_best_solver(
     vbs_solved = len(solved_by_any)
     
     # Best single solver
-    solver_solved = solved_df.groupby('solver_name')['benchmark_name'].nunique()
+    solver_solved = solved_df.groupby('solver_name', observed=True)['benchmark_name'].nunique()
     best_single_solver = solver_solved.idxmax() if len(solver_solved) > 0 else None
     best_single_solved = solver_solved.max() if len(solver_solved) > 0 else 0
     
@@ -239,7 +396,7 @@ async def get_pairwise_comparison(
     if not runs:
         return {"message": "No runs found"}
     
-    df = pd.DataFrame(runs)
+    df = runs_to_dataframe(runs)
     solvers = list(df['solver_name'].unique())
     
     # If specific solvers requested, do detailed comparison
@@ -287,7 +444,8 @@ async def get_pairwise_comparison(
         index='benchmark_name',
         columns='solver_name',
         values='wall_time_seconds',
-        aggfunc='first'
+        aggfunc='first',
+        observed=True
     )
     
     # Pivot results
@@ -295,7 +453,8 @@ async def get_pairwise_comparison(
         index='benchmark_name',
         columns='solver_name',
         values='result',
-        aggfunc='first'
+        aggfunc='first',
+        observed=True
     )
     
     for i, s1 in enumerate(solvers):
@@ -341,7 +500,8 @@ async def get_pairwise_comparison(
 async def get_cactus_plot_data(
     request: Request,
     experiment_id: Optional[int] = None,
-    solver_ids: Optional[str] = None
+    solver_ids: Optional[str] = None,
+    families: Optional[str] = None
 ) -> Dict:
     """Get data for cactus plot"""
     db = request.app.state.db
@@ -354,21 +514,27 @@ async def get_cactus_plot_data(
     if not runs:
         return {"series": []}
     
-    df = pd.DataFrame(runs)
+    df = runs_to_dataframe(runs)
     
-    # Filter solvers if specified
+    # Filter solvers / families with a single combined mask
+    mask = None
     if solver_ids:
-        ids = [int(x) for x in solver_ids.split(',')]
-        df = df[df['solver_id'].isin(ids)]
+        try:
+            ids = parse_id_ranges(solver_ids)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid solver_ids: {solver_ids}")
+        mask = df['solver_id'].isin(ids)
+    if families:
+        family_mask = df['benchmark_family'].isin(families.split(','))
+        mask = family_mask if mask is None else mask & family_mask
+    if mask is not None:
+        df = df.loc[mask]
     
     series = []
+    solved_times = _sorted_solved_times(df)
     
     for solver in df['solver_name'].unique():
-        solver_df = df[df['solver_name'] == solver]
-        
-        # Only solved instances
-        solved = solver_df[solver_df['result'].isin(['SAT', 'UNSAT'])]
-        times = sorted(solved['wall_time_seconds'].dropna().tolist())
+        times = solved_times.get(solver, [])
         
         data_points = [
             {"x": i + 1, "y": t}
@@ -407,14 +573,15 @@ async def get_scatter_plot_data(
     if not runs:
         return {"points": []}
     
-    df = pd.DataFrame(runs)
+    df = runs_to_dataframe(runs)
     
     # Pivot
     pivot = df.pivot_table(
         index='benchmark_name',
         columns='solver_name',
         values='wall_time_seconds',
-        aggfunc='first'
+        aggfunc='first',
+        observed=True
     )
     
     if solver1 not in pivot.columns or solver2 not in pivot.columns:
@@ -425,7 +592,8 @@ async def get_scatter_plot_data(
         index='benchmark_name',
         columns='solver_name',
         values='result',
-        aggfunc='first'
+        aggfunc='first',
+        observed=True
     )
     
     points = []
@@ -455,7 +623,8 @@ async def get_scatter_plot_data(
 async def get_heatmap_data(
     request: Request,
     experiment_id: Optional[int] = None,
-    metric: str = "wall_time_seconds"
+    metric: str = "wall_time_seconds",
+    max_benchmarks: int = Query(50, ge=1, le=1000)
 ) -> Dict:
     """Get data for result heatmap"""
     db = request.app.state.db
@@ -468,35 +637,38 @@ async def get_heatmap_data(
     if not runs:
         return {"data": [], "solvers": [], "benchmarks": []}
     
-    df = pd.DataFrame(runs)
+    df = runs_to_dataframe(runs)
     
     # Limit to manageable size
-    top_benchmarks = df['benchmark_name'].value_counts().head(50).index.tolist()
+    top_benchmarks = _top_benchmarks(df, max_benchmarks)
     df = df[df['benchmark_name'].isin(top_benchmarks)]
     
     pivot = df.pivot_table(
         index='benchmark_name',
         columns='solver_name',
         values=metric,
-        aggfunc='first'
+        aggfunc='first',
+        observed=True
     )
     
     # Convert to format for heatmap
+    values = pivot.to_numpy(dtype=float)
+    solvers = list(pivot.columns)
     data = []
     for i, benchmark in enumerate(pivot.index):
-        for j, solver in enumerate(pivot.columns):
-            value = pivot.loc[benchmark, solver]
+        for j, solver in enumerate(solvers):
+            value = values[i, j]
             data.append({
                 "x": j,
                 "y": i,
-                "value": float(value) if pd.notna(value) else None,
+                "value": None if np.isnan(value) else float(value),
                 "benchmark": benchmark,
                 "solver": solver
             })
     
     return {
         "data": data,
-        "solvers": list(pivot.columns),
+        "solvers": solvers,
         "benchmarks": list(pivot.index),
         "metric": metric
     }
@@ -519,14 +691,15 @@ async def get_performance_profile(
     if not runs:
         return {"series": []}
     
-    df = pd.DataFrame(runs)
+    df = runs_to_dataframe(runs)
     
     # Get times matrix
     pivot = df.pivot_table(
         index='benchmark_name',
         columns='solver_name',
         values='wall_time_seconds',
-        aggfunc='first'
+        aggfunc='first',
+        observed=True
     ).fillna(float('inf'))
     
     # Calculate ratios to virtual best
@@ -574,26 +747,17 @@ async def get_family_analysis(
     if not runs:
         return {"families": {}}
     
-    df = pd.DataFrame(runs)
-    
-    result = {}
+    df = runs_to_dataframe(runs)
     
-    for family in df['benchmark_family'].unique():
-        family_df = df[df['benchmark_family'] == family]
-        
-        family_stats = {}
-        for solver in family_df['solver_name'].unique():
-            solver_df = family_df[family_df['solver_name'] == solver]
-            solved = solver_df[solver_df['result'].isin(['SAT', 'UNSAT'])]
-            
-            family_stats[solver] = {
-                'total': len(solver_df),
-                'solved': len(solved),
-                'solved_pct': round(len(solved) / len(solver_df) * 100, 2) if len(solver_df) > 0 else 0,
-                'avg_time': round(solved['wall_time_seconds'].mean(), 2) if len(solved) > 0 else None
-            }
-        
-        result[family] = family_stats
+    result = {family: {} for family in _unique_families(df)}
+    for (family, solver), row in _family_solver_stats(df).iterrows():
+        total, solved = int(row['total']), int(row['solved'])
+        result[family][solver] = {
+            'total': total,
+            'solved': solved,
+            'solved_pct': round(solved / total * 100, 2) if total > 0 else 0,
+            'avg_time': round(row['avg_time'], 2) if solved > 0 else None
+        }
     
     return {"families": result}
 
@@ -613,14 +777,9 @@ async def get_cactus_data(
     if not runs:
         return {"solvers": {}}
     
-    df = pd.DataFrame(runs)
-    result = {}
-    
-    for solver in df['solver_name'].unique():
-        solver_df = df[df['solver_name'] == solver]
-        solved = solver_df[solver_df['result'].isin(['SAT', 'UNSAT'])]
-        times = sorted(solved['wall_time_seconds'].dropna().tolist())
-        result[solver] = times
+    df = runs_to_dataframe(runs)
+    solved_times = _sorted_solved_times(df)
+    result = {solver: solved_times.get(solver, []) for solver in df['solver_name'].unique()}
     
     return {"solvers": result, "timeout": timeout}
 
@@ -637,7 +796,7 @@ async def get_scatter_data(
     if not runs:
         return {"solvers": [], "points": []}
     
-    df = pd.DataFrame(runs)
+    df = runs_to_dataframe(runs)
     solvers = list(df['solver_name'].unique())
     
     # Create all pairwise points
@@ -645,7 +804,8 @@ async def get_scatter_data(
         index='benchmark_name',
         columns='solver_name',
         values='wall_time_seconds',
-        aggfunc='first'
+        aggfunc='first',
+        observed=True
     )
     
     points = []
@@ -682,14 +842,15 @@ async def get_ecdf_data(
     if not runs:
         return {"profiles": {}}
     
-    df = pd.DataFrame(runs)
+    df = runs_to_dataframe(runs)
     
     # Get times matrix
     pivot = df.pivot_table(
         index='benchmark_name',
         columns='solver_name',
         values='wall_time_seconds',
-        aggfunc='first'
+        aggfunc='first',
+        observed=True
     ).fillna(float('inf'))
     
     if pivot.empty:
@@ -724,7 +885,8 @@ async def get_ecdf_data(
 @router.get("/heatmap")
 async def get_heatmap_data_simple(
     request: Request,
-    experiment_id: int
+    experiment_id: int,
+    max_benchmarks: int = Query(50, ge=1, le=1000)
 ) -> Dict:
     """Get data for heatmap visualization"""
     db = request.app.state.db
@@ -733,27 +895,25 @@ async def get_heatmap_data_simple(
     if not runs:
         return {"solvers": [], "benchmarks": [], "matrix": {}}
     
-    df = pd.DataFrame(runs)
+    df = runs_to_dataframe(runs)
     
     # Limit benchmarks
-    top_benchmarks = df.groupby('benchmark_name')['wall_time_seconds'].count()
-    top_benchmarks = top_benchmarks.nlargest(50).index.tolist()
+    top_benchmarks = _top_benchmarks(df, max_benchmarks, timed_only=True)
     df = df[df['benchmark_name'].isin(top_benchmarks)]
     
     pivot = df.pivot_table(
         index='benchmark_name',
         columns='solver_name',
         values='wall_time_seconds',
-        aggfunc='first'
+        aggfunc='first',
+        observed=True
     )
     
     # Build matrix: solver -> benchmark -> time
-    matrix = {}
-    for solver in pivot.columns:
-        matrix[solver] = {}
-        for benchmark in pivot.index:
-            val = pivot.loc[benchmark, solver]
-            matrix[solver][benchmark] = float(val) if pd.notna(val) else None
+    matrix = {
+        solver: {b: (None if pd.isna(v) else float(v)) for b, v in column.items()}
+        for solver, column in pivot.items()
+    }
     
     max_time = df['wall_time_seconds'].max() if not df.empty else 5000
     
@@ -778,43 +938,27 @@ async def get_analysis_by_family(
     if not runs:
         return {"families": []}
     
-    df = pd.DataFrame(runs)
+    df = runs_to_dataframe(runs)
+    
+    # Conteo de benchmarks y stats por (familia, solver) en sendos groupby
+    family_counts = df.groupby('benchmark_family', observed=True)['benchmark_name'].nunique()
+    solvers_by_family = {family: [] for family in _unique_families(df)}
+    for (family, solver), row in _family_solver_stats(df, timeout).iterrows():
+        solved = int(row['solved'])
+        solvers_by_family[family].append({
+            'name': solver,
+            'solved': solved,
+            'par2': round(row['par2'], 2),
+            'avg_time': round(row['avg_time'], 3) if solved > 0 else 0
+        })
     
     families = []
-    
-    for family in df['benchmark_family'].unique():
-        family_df = df[df['benchmark_family'] == family]
-        family_count = len(family_df['benchmark_name'].unique())
-        
-        solvers = []
-        for solver in family_df['solver_name'].unique():
-            solver_df = family_df[family_df['solver_name'] == solver]
-            solved = solver_df[solver_df['result'].isin(['SAT', 'UNSAT'])]
-            
-            # Calculate PAR-2 for this family
-            def par2_time(row):
-                if pd.isna(row.get('wall_time_seconds')):
-                    return 2 * timeout
-                if row.get('result') in ['TIMEOUT', 'MEMOUT', 'ERROR', 'UNKNOWN']:
-                    return 2 * timeout
-                return row['wall_time_seconds']
-            
-            solver_df = solver_df.copy()
-            solver_df['par2'] = solver_df.apply(par2_time, axis=1)
-            
-            solvers.append({
-                'name': solver,
-                'solved': len(solved),
-                'par2': round(solver_df['par2'].mean(), 2),
-                'avg_time': round(solved['wall_time_seconds'].mean(), 3) if len(solved) > 0 else 0
-            })
-        
+    for family, solvers in solvers_by_family.items():
         # Sort by PAR-2
         solvers.sort(key=lambda x: x['par2'])
-        
         families.append({
             'name': family,
-            'count': family_count,
+            'count': int(family_counts.get(family, 0)),
             'solvers': solvers
         })
     
@@ -829,23 +973,15 @@ async def export_results(
 ):
     """Export experiment results"""
     from fastapi.responses import StreamingResponse
-    import io
     
     db = request.app.state.db
-    runs = db.get_runs(experiment_id=experiment_id)
-    
-    if not runs:
+    first_page = db.get_runs(experiment_id=experiment_id, limit=EXPORT_PAGE_SIZE, after_id=0)
+    if not first_page:
         raise HTTPException(status_code=404, detail="No results found")
     
-    df = pd.DataFrame(runs)
-    
     if format == "csv":
-        output = io.StringIO()
-        df.to_csv(output, index=False)
-        output.seek(0)
-        
         return StreamingResponse(
-            iter([output.getvalue()]),
+            _iter_runs_csv(db, experiment_id, first_page),
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename=experiment_{experiment_id}_results.csv"}
         )
@@ -872,7 +1008,7 @@ async def get_statistical_tests(
     if not runs:
         raise HTTPException(status_code=404, detail="No runs found")
     
-    df = pd.DataFrame(runs)
+    df = runs_to_dataframe(runs)
     
     # Get runs for each solver
     df1 = df[df['solver_name'] == solver1]
@@ -1058,7 +1194,7 @@ async def get_cdcl_metrics(
     if not runs:
         raise HTTPException(status_code=404, detail="No runs found")
     
-    df = pd.DataFrame(runs)
+    df = runs_to_dataframe(runs)
     
     def safe_float(val, default=0.0):
         """Convert value to float safely, handling NaN/Inf"""
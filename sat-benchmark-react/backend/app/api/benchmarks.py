@@ -2,15 +2,22 @@
 Benchmarks API endpoints
 """
 
-from fastapi import APIRouter, Depends, Request, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import APIRouter, Request, HTTPException, UploadFile, File, BackgroundTasks, Query
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator, Tuple
 from pathlib import Path
-import shutil
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, BrokenExecutor
+from collections import OrderedDict
+import numpy as np
+import asyncio
 import hashlib
+import mmap
 import re
 import os
 import logging
+import threading
+
+from app.core.utils import parse_id_ranges
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +35,10 @@ class BenchmarkCreate(BaseModel):
     tags: Optional[str] = None
 
 
+class BenchmarkBatchDelete(BaseModel):
+    ids: str  # e.g. "1-100, 205, 300-310"
+
+
 class BenchmarkFilter(BaseModel):
     family: Optional[str] = None
     difficulty: Optional[str] = None
@@ -37,48 +48,95 @@ class BenchmarkFilter(BaseModel):
 
 # ==================== HELPER FUNCTIONS ====================
 
+# Cabecera DIMACS "p cnf <vars> <clauses>"; casi siempre está en los primeros KB
+_CNF_HEADER_RE = re.compile(rb'^[ \t]*p cnf[ \t]+(\d+)[ \t]+(\d+)', re.MULTILINE)
+_HEADER_READ_SIZE = 64 * 1024
+
+
+def _search_cnf_header(buf: bytes, end: int) -> Optional[re.Match]:
+    """
+    Locate 'p cnf' with bytes.find (C memchr-style scan) and run the regex only
+    on the candidate lines, instead of letting the regex test every offset.
+    """
+    pos = buf.find(b'p cnf', 0, end)
+    while pos != -1:
+        line_start = buf.rfind(b'\n', 0, pos) + 1
+        match = _CNF_HEADER_RE.match(buf, line_start, end)
+        if match:
+            return match
+        pos = buf.find(b'p cnf', pos + 1, end)
+    return None
+
+
+def _find_cnf_header(f) -> Optional[re.Match]:
+    """Scan a binary file for the header, 64 KB at a time (usually one read)"""
+    buf = b''
+    while True:
+        chunk = f.read(_HEADER_READ_SIZE)
+        buf += chunk
+        # Solo líneas completas, salvo al final del fichero
+        end = len(buf) if not chunk else buf.rfind(b'\n') + 1
+        match = _search_cnf_header(buf, end)
+        if match or not chunk:
+            return match
+        buf = buf[end:]
+
+
+def _header_metadata(match: Optional[re.Match]) -> Dict:
+    """Header dict from a _CNF_HEADER_RE match (None values if no header)"""
+    if not match:
+        return {'num_variables': None, 'num_clauses': None, 'clause_variable_ratio': None}
+    num_vars = int(match.group(1))
+    num_clauses = int(match.group(2))
+    ratio = num_clauses / num_vars if num_vars > 0 else 0
+    return {
+        'num_variables': num_vars,
+        'num_clauses': num_clauses,
+        'clause_variable_ratio': round(ratio, 2)
+    }
+
+
 def parse_cnf_header(filepath: str) -> Dict:
     """Parse CNF file header to extract metadata"""
     try:
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith('p cnf'):
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        num_vars = int(parts[2])
-                        num_clauses = int(parts[3])
-                        ratio = num_clauses / num_vars if num_vars > 0 else 0
-                        return {
-                            'num_variables': num_vars,
-                            'num_clauses': num_clauses,
-                            'clause_variable_ratio': round(ratio, 2)
-                        }
-        return {'num_variables': None, 'num_clauses': None, 'clause_variable_ratio': None}
+        with open(filepath, 'rb') as f:
+            return _header_metadata(_find_cnf_header(f))
     except Exception as e:
         logger.error(f"Error parsing CNF {filepath}: {e}")
-        return {'num_variables': None, 'num_clauses': None, 'clause_variable_ratio': None}
+        return _header_metadata(None)
+
+
+FAMILY_PATTERNS = {
+    'circuit': r'(circuit|lec|mult|add|barrel)',
+    'crypto': r'(crypto|aes|des|md5|sha|hash)',
+    'planning': r'(planning|block|gripper|hanoi)',
+    'graph': r'(graph|color|clique|ramsey)',
+    'scheduling': r'(schedule|job|task|timetable)',
+    'random': r'(random|rnd|uniform)',
+    'crafted': r'(pigeon|php|parity|queen)',
+    'industrial': r'(bmcbonus|velev|ibm|intel)',
+    'verification': r'(verify|bmc|safety|reach)'
+}
+
+
+def _compile_family_regex(patterns: Dict[str, str]) -> re.Pattern:
+    """
+    Union of all family patterns in one compiled regex. Each alternative is a
+    lookahead anchored at the start, so the first family (in dict order) that
+    matches anywhere wins — same priority as testing them one by one.
+    """
+    alternatives = '|'.join(f'(?P<{name}>(?=.*?{pattern}))' for name, pattern in patterns.items())
+    return re.compile(f'^(?:{alternatives})', re.DOTALL)
+
+
+# Compilada una vez al importar el módulo
+_FAMILY_REGEX = _compile_family_regex(FAMILY_PATTERNS)
 
 
 def classify_family(filename: str) -> str:
     """Classify benchmark family based on filename patterns"""
-    patterns = {
-        'circuit': r'(circuit|lec|mult|add|barrel)',
-        'crypto': r'(crypto|aes|des|md5|sha|hash)',
-        'planning': r'(planning|block|gripper|hanoi)',
-        'graph': r'(graph|color|clique|ramsey)',
-        'scheduling': r'(schedule|job|task|timetable)',
-        'random': r'(random|rnd|uniform)',
-        'crafted': r'(pigeon|php|parity|queen)',
-        'industrial': r'(bmcbonus|velev|ibm|intel)',
-        'verification': r'(verify|bmc|safety|reach)'
-    }
-    
-    filename_lower = filename.lower()
-    for family, pattern in patterns.items():
-        if re.search(pattern, filename_lower):
-            return family
-    return 'other'
+    match = _FAMILY_REGEX.match(filename.lower())
+    return match.lastgroup if match else 'other'
 
 
 def estimate_difficulty(num_variables: int, num_clauses: int, ratio: float) -> str:
@@ -94,13 +152,306 @@ def estimate_difficulty(num_variables: int, num_clauses: int, ratio: float) -> s
         return 'hard'
 
 
-def get_file_checksum(filepath: str) -> str:
-    """Calculate MD5 checksum of file"""
+def estimate_difficulty_bulk(nvars: np.ndarray, ratios: np.ndarray) -> np.ndarray:
+    """
+    Vectorized estimate_difficulty() over whole columns (NaN = missing).
+    Same thresholds; a missing or zero ratio never counts as 'low'.
+    """
+    nvars = np.asarray(nvars, dtype=float)
+    ratios = np.nan_to_num(np.asarray(ratios, dtype=float), nan=np.inf)
+    ratios[ratios == 0] = np.inf
+    return np.select(
+        [np.isnan(nvars), (nvars < 1000) | (ratios < 3.0), (nvars < 10000) | (ratios < 5.0)],
+        ['unknown', 'easy', 'medium'],
+        default='hard'
+    )
+
+
+_MMAP_MIN_SIZE = 1 << 20
+_MMAP_HASH_CHUNK = 64 << 20
+
+
+def _md5_of_file(f) -> str:
+    """
+    MD5 of an open binary file from its current position. Files of 1 MiB or
+    more are mapped and hashed in 64 MiB memoryview slices (no read copies);
+    smaller files, or ones that cannot be mapped, use file_digest/read.
+    """
+    start = f.tell()
+    if os.fstat(f.fileno()).st_size - start >= _MMAP_MIN_SIZE:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher = hashlib.md5()
+                with memoryview(mm) as view:
+                    for offset in range(start, len(view), _MMAP_HASH_CHUNK):
+                        hasher.update(view[offset:offset + _MMAP_HASH_CHUNK])
+                return hasher.hexdigest()
+        except (OSError, ValueError):
+            pass
+    if hasattr(hashlib, 'file_digest'):
+        return hashlib.file_digest(f, 'md5').hexdigest()
     hasher = hashlib.md5()
+    for chunk in iter(lambda: f.read(1 << 20), b''):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def get_file_checksum(filepath: str) -> str:
+    """
+    Calculate MD5 checksum of file.
+    
+    Stays MD5 so checksums match the ones already stored (duplicate detection).
+    hashlib.file_digest (Python 3.11+) reads and hashes in C; older versions
+    fall back to 1 MiB blocks.
+    """
+    with open(filepath, 'rb') as f:
+        return _md5_of_file(f)
+
+
+COMPLETENESS_FIELDS = (
+    ('missing_variables', 'num_variables'),
+    ('missing_clauses', 'num_clauses'),
+    ('unknown_family', 'family'),
+    ('unknown_difficulty', 'difficulty'),
+    ('missing_checksum', 'checksum'),
+)
+
+
+def build_quality_table(total: int, completeness: Dict) -> List[Dict]:
+    """Per-field complete/incomplete counts and % complete, computed as one vector op"""
+    missing = np.array([completeness.get(key, 0) or 0 for key, _ in COMPLETENESS_FIELDS], dtype=np.int64)
+    complete = total - missing
+    pct = np.round(complete.astype(np.float64) / total * 100, 1) if total else np.zeros(len(missing))
+    return [
+        {"field": field, "complete": int(c), "incomplete": int(m), "percent_complete": float(p)}
+        for (_, field), c, m, p in zip(COMPLETENESS_FIELDS, complete, missing, pct)
+    ]
+
+
+def parse_benchmark_file(filepath: str) -> Dict:
+    """
+    Extract all metadata stored for a benchmark (header, family, difficulty,
+    size and checksum). Top-level so it can be pickled into a process pool.
+    
+    One open per file: size via fstat, header from the first block, then the
+    same descriptor is rewound for the checksum.
+    """
     with open(filepath, 'rb') as f:
-        for chunk in iter(lambda: f.read(8192), b''):
+        size_bytes = os.fstat(f.fileno()).st_size
+        try:
+            metadata = _header_metadata(_find_cnf_header(f))
+        except Exception as e:
+            logger.error(f"Error parsing CNF {filepath}: {e}")
+            metadata = _header_metadata(None)
+        f.seek(0)
+        checksum = _md5_of_file(f)
+    
+    metadata['family'] = classify_family(os.path.basename(filepath))
+    metadata['difficulty'] = estimate_difficulty(
+        metadata.get('num_variables'),
+        metadata.get('num_clauses'),
+        metadata.get('clause_variable_ratio')
+    )
+    metadata['size_bytes'] = size_bytes
+    metadata['checksum'] = checksum
+    return metadata
+
+
+# Metadatos ya calculados, por (ruta, mtime_ns, tamaño): re-escanear un corpus
+# sin cambios no vuelve a leer ni a hashear los ficheros
+_METADATA_CACHE: "OrderedDict[tuple, Dict]" = OrderedDict()
+_METADATA_CACHE_MAX = 100_000
+
+
+def _metadata_cache_key(filepath: str) -> Optional[tuple]:
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return (os.path.abspath(filepath), st.st_mtime_ns, st.st_size)
+
+
+def _metadata_cache_put(key: Optional[tuple], metadata: Dict):
+    if key is None:
+        return
+    _METADATA_CACHE[key] = metadata
+    _METADATA_CACHE.move_to_end(key)
+    while len(_METADATA_CACHE) > _METADATA_CACHE_MAX:
+        _METADATA_CACHE.popitem(last=False)
+
+
+def _parse_benchmark_safe(filepath: str) -> Tuple[str, Optional[Dict], Optional[Exception]]:
+    """parse_benchmark_file() that returns the error instead of raising (for pool map)"""
+    try:
+        return filepath, parse_benchmark_file(filepath), None
+    except Exception as e:
+        return filepath, None, e
+
+
+def iter_parsed_benchmarks(
+    filepaths: List[str],
+    max_workers: Optional[int] = None,
+    use_processes: Optional[bool] = None
+) -> Iterator[Tuple[str, Optional[Dict], Optional[Exception]]]:
+    """
+    Parse CNF files in parallel, yielding (filepath, metadata, error). Files
+    whose (path, mtime, size) were already parsed are served from a cache
+    first; the rest keep input order. Processes by default (parsing is
+    CPU-bound); threads are used when configured or when a process pool
+    cannot be created.
+    """
+    from app.core.config import settings
+    
+    if max_workers is None:
+        max_workers = settings.BENCHMARK_PARSE_WORKERS or os.cpu_count() or 1
+    if use_processes is None:
+        use_processes = settings.BENCHMARK_PARSE_USE_PROCESSES
+    
+    # Ficheros sin cambios desde el último parseo salen de la cache
+    keys = {}
+    pending = []
+    for path in filepaths:
+        key = _metadata_cache_key(path)
+        cached = _METADATA_CACHE.get(key) if key is not None else None
+        if cached is not None:
+            yield path, dict(cached), None
+        else:
+            keys[path] = key
+            pending.append(path)
+    
+    for path, metadata, error in _parse_uncached(pending, max_workers, use_processes):
+        if error is None:
+            _metadata_cache_put(keys.get(path), dict(metadata))
+        yield path, metadata, error
+
+
+# Pools compartidos entre peticiones, por (procesos?, workers): arrancar N
+# procesos por cada subida de un par de ficheros cuesta más que parsearlos
+_PARSE_POOLS: Dict[Tuple[bool, int], Executor] = {}
+_PARSE_POOLS_LOCK = threading.Lock()
+
+
+def _get_parse_pool(use_processes: bool, max_workers: int) -> Executor:
+    """Shared parse pool, created on first use (threads if processes are unavailable)"""
+    with _PARSE_POOLS_LOCK:
+        key = (use_processes, max_workers)
+        executor = _PARSE_POOLS.get(key)
+        if executor is None:
+            if use_processes:
+                try:
+                    executor = ProcessPoolExecutor(max_workers=max_workers)
+                except (OSError, NotImplementedError) as e:
+                    logger.warning("Process pool unavailable (%s), falling back to threads", e)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=max_workers)
+            _PARSE_POOLS[key] = executor
+        return executor
+
+
+def _parse_uncached(
+    filepaths: List[str],
+    max_workers: int,
+    use_processes: bool
+) -> Iterator[Tuple[str, Optional[Dict], Optional[Exception]]]:
+    """Parse files sequentially or in a shared process/thread pool"""
+    from app.core.config import settings
+    
+    if len(filepaths) < 2 or max_workers <= 1:
+        yield from map(_parse_benchmark_safe, filepaths)
+        return
+    
+    # Procesos solo para lotes grandes; pocos ficheros van a hilos
+    use_processes = use_processes and len(filepaths) >= settings.BENCHMARK_PARSE_PROCESS_MIN_FILES
+    executor = _get_parse_pool(use_processes, max_workers)
+    
+    # map() con chunksize: cada worker recibe lotes de rutas (menos IPC por fichero)
+    chunksize = max(1, min(32, len(filepaths) // (max_workers * 4)))
+    try:
+        yield from executor.map(_parse_benchmark_safe, filepaths, chunksize=chunksize)
+    except BrokenExecutor:
+        # Un worker murió (OOM, kill): se descarta el pool y se recrea en la próxima llamada
+        with _PARSE_POOLS_LOCK:
+            if _PARSE_POOLS.get((use_processes, max_workers)) is executor:
+                del _PARSE_POOLS[(use_processes, max_workers)]
+        raise
+
+
+def parse_many(
+    filepaths: List[str],
+    max_workers: Optional[int] = None,
+    use_processes: Optional[bool] = None
+) -> List[Tuple[str, Optional[Dict], Optional[Exception]]]:
+    """Parse a whole corpus in parallel (cached files first, then input order)"""
+    return list(iter_parsed_benchmarks(filepaths, max_workers, use_processes))
+
+
+async def _find_cnf_header_async(f) -> Optional[re.Match]:
+    """_find_cnf_header() over an aiofiles handle"""
+    buf = b''
+    while True:
+        chunk = await f.read(_HEADER_READ_SIZE)
+        buf += chunk
+        end = len(buf) if not chunk else buf.rfind(b'\n') + 1
+        match = _search_cnf_header(buf, end)
+        if match or not chunk:
+            return match
+        buf = buf[end:]
+
+
+async def parse_benchmark_file_async(filepath: str) -> Dict:
+    """
+    parse_benchmark_file() with non-blocking reads (aiofiles), for benchmark
+    directories on network mounts where each read stalls on latency.
+    """
+    import aiofiles
+    
+    async with aiofiles.open(filepath, 'rb') as f:
+        size_bytes = os.fstat(f.fileno()).st_size
+        try:
+            metadata = _header_metadata(await _find_cnf_header_async(f))
+        except Exception as e:
+            logger.error(f"Error parsing CNF {filepath}: {e}")
+            metadata = _header_metadata(None)
+        await f.seek(0)
+        hasher = hashlib.md5()
+        while chunk := await f.read(1 << 20):
             hasher.update(chunk)
-    return hasher.hexdigest()
+    
+    metadata['family'] = classify_family(os.path.basename(filepath))
+    metadata['difficulty'] = estimate_difficulty(
+        metadata.get('num_variables'),
+        metadata.get('num_clauses'),
+        metadata.get('clause_variable_ratio')
+    )
+    metadata['size_bytes'] = size_bytes
+    metadata['checksum'] = hasher.hexdigest()
+    return metadata
+
+
+async def parse_many_async(
+    filepaths: List[str],
+    concurrency: int = 64
+) -> List[Tuple[str, Optional[Dict], Optional[Exception]]]:
+    """
+    Parse many files with overlapping I/O (asyncio.gather). The semaphore caps
+    open descriptors; results keep input order and share the metadata cache.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def parse_one(path: str):
+        key = _metadata_cache_key(path)
+        cached = _METADATA_CACHE.get(key) if key is not None else None
+        if cached is not None:
+            return path, dict(cached), None
+        async with semaphore:
+            try:
+                metadata = await parse_benchmark_file_async(path)
+            except Exception as e:
+                return path, None, e
+        _metadata_cache_put(key, dict(metadata))
+        return path, metadata, None
+    
+    return await asyncio.gather(*(parse_one(p) for p in filepaths))
 
 
 # ==================== ENDPOINTS ====================
@@ -111,6 +462,7 @@ async def list_benchmarks(
     family: Optional[str] = None,
     difficulty: Optional[str] = None,
     limit: Optional[int] = None,
+    offset: int = 0,
     page: Optional[int] = None,
     page_size: int = 50,
     search: Optional[str] = None,
@@ -127,7 +479,10 @@ async def list_benchmarks(
         return result
 
     # Legacy: return flat list (with optional limit)
-    items = db.get_benchmarks(family=family, difficulty=difficulty, limit=limit)
+    items = db.get_benchmarks(
+        family=family, difficulty=difficulty,
+        limit=limit, offset=offset, search=search
+    )
     return {"items": items, "total": len(items), "page": 1, "page_size": len(items), "pages": 1}
 
 
@@ -138,12 +493,29 @@ async def get_families(request: Request) -> List[Dict]:
     return db.get_benchmark_families()
 
 
+@router.get("/ids")
+async def get_benchmark_ids(
+    request: Request,
+    family: List[str] = Query([]),
+    difficulty: List[str] = Query([]),
+) -> List[int]:
+    """Benchmark IDs for the given families and/or difficulties (no full rows)"""
+    db = request.app.state.db
+    ids: List[int] = []
+    if family:
+        ids.extend(db.get_benchmark_ids_by('family', family))
+    if difficulty:
+        ids.extend(db.get_benchmark_ids_by('difficulty', difficulty))
+    return list(dict.fromkeys(ids))
+
+
 @router.get("/stats")
 async def get_benchmark_stats(request: Request) -> Dict:
     """Get benchmark statistics using SQL aggregates (no full table scan)"""
     db = request.app.state.db
     families = db.get_benchmark_families()
     agg = db.get_benchmark_aggregates()
+    completeness = agg.get("completeness", {})
 
     return {
         "total": agg.get("total", 0),
@@ -151,9 +523,103 @@ async def get_benchmark_stats(request: Request) -> Dict:
         "difficulty_distribution": agg.get("difficulty_distribution", {}),
         "avg_variables": agg.get("avg_variables", 0),
         "avg_clauses": agg.get("avg_clauses", 0),
+        "completeness": completeness,
+        "quality": build_quality_table(agg.get("total", 0), completeness),
+    }
+
+
+@router.get("/duplicates")
+async def get_duplicate_benchmarks(
+    request: Request,
+    page: Optional[int] = None,
+    page_size: int = Query(25, ge=1, le=500),
+    summary: bool = False,
+):
+    """
+    Find benchmarks with identical content (same checksum), optionally paginated
+    by group. summary=true returns only checksum/count/first filename per group;
+    members are then fetched with GET /duplicates/{checksum}.
+    """
+    db = request.app.state.db
+    details = not summary
+    if page is None:
+        return db.find_duplicate_benchmarks(details=details)
+    
+    page = max(1, page)
+    total = db.count_duplicate_groups()
+    items = db.find_duplicate_benchmarks(
+        limit=page_size, offset=(page - 1) * page_size, details=details
+    )
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "pages": max(1, (total + page_size - 1) // page_size),
     }
 
 
+def _filter_invalid(invalid: List[Dict], unknown_family: bool, unknown_difficulty: bool) -> List[Dict]:
+    """Narrow the invalid-benchmark list with boolean masks over category columns"""
+    import pandas as pd
+    
+    if not invalid or not (unknown_family or unknown_difficulty):
+        return invalid
+    
+    # Máscaras booleanas sobre columnas categóricas (comparación de códigos enteros)
+    df = pd.DataFrame(invalid).astype({'family': 'category', 'difficulty': 'category'})
+    mask = np.ones(len(df), dtype=bool)
+    if unknown_family:
+        mask &= (df['family'] == 'unknown').to_numpy()
+    if unknown_difficulty:
+        mask &= (df['difficulty'] == 'unknown').to_numpy()
+    return [invalid[i] for i in np.flatnonzero(mask)]
+
+
+@router.get("/invalid")
+async def get_invalid_benchmarks(
+    request: Request,
+    unknown_family: bool = False,
+    unknown_difficulty: bool = False,
+) -> List[Dict]:
+    """Benchmarks with incomplete metadata, optionally narrowed to unknown family/difficulty"""
+    db = request.app.state.db
+    return _filter_invalid(db.find_invalid_benchmarks(), unknown_family, unknown_difficulty)
+
+
+@router.get("/cleanup-report")
+async def get_cleanup_report(request: Request) -> Dict:
+    """Duplicates, invalid benchmarks and completeness in one call (queries run concurrently)"""
+    db = request.app.state.db
+    
+    # Cada consulta abre su propia conexión; con WAL las lecturas no se bloquean.
+    # Corren en hilos y se esperan con await, sin bloquear el event loop.
+    duplicates, invalid, agg = await asyncio.gather(
+        asyncio.to_thread(db.find_duplicate_benchmarks),
+        asyncio.to_thread(db.find_invalid_benchmarks),
+        asyncio.to_thread(db.get_benchmark_aggregates),
+    )
+    completeness = agg.get("completeness", {})
+    return {
+        "duplicates": duplicates,
+        "invalid": invalid,
+        "total": agg.get("total", 0),
+        "completeness": completeness,
+        "quality": build_quality_table(agg.get("total", 0), completeness),
+    }
+
+
+@router.get("/search")
+async def search_benchmarks(
+    request: Request,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(50, ge=1, le=500),
+) -> List[Dict]:
+    """Search benchmarks by filename (SQL LIKE, minimal columns)"""
+    db = request.app.state.db
+    return db.search_benchmarks(q, limit=limit)
+
+
 @router.get("/{benchmark_id}")
 async def get_benchmark(benchmark_id: int, request: Request) -> Dict:
     """Get a specific benchmark by ID"""
@@ -205,12 +671,96 @@ async def delete_benchmark(benchmark_id: int, request: Request) -> Dict:
     return {"message": "Benchmark deleted successfully"}
 
 
+@router.post("/delete-batch")
+async def delete_benchmarks_batch(body: BenchmarkBatchDelete, request: Request) -> Dict:
+    """
+    Delete several benchmarks given an ID spec with ranges ('1-100, 205').
+    Benchmarks referenced by runs are kept and reported in skipped_with_runs.
+    """
+    db = request.app.state.db
+    try:
+        ids = parse_id_ranges(body.ids)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid ID list: {body.ids}")
+    
+    return db.delete_benchmarks_batch(ids)
+
+
+@router.get("/duplicates/{checksum}")
+async def get_duplicate_group(checksum: str, request: Request) -> List[Dict]:
+    """Benchmarks belonging to one duplicate group"""
+    db = request.app.state.db
+    group = db.get_duplicate_group(checksum)
+    if len(group) < 2:
+        raise HTTPException(status_code=404, detail="Duplicate group not found")
+    return group
+
+
+@router.post("/duplicates/{checksum}/keep-best")
+async def keep_best_duplicate(checksum: str, request: Request) -> Dict:
+    """Keep the most complete copy of a duplicate group and delete the others"""
+    db = request.app.state.db
+    result = db.keep_best_duplicate(checksum)
+    if result["kept"] is None:
+        raise HTTPException(status_code=404, detail="Duplicate group not found")
+    return result
+
+
+@router.post("/reclassify-difficulty")
+async def reclassify_difficulty(request: Request) -> Dict:
+    """
+    Recompute difficulty for every benchmark from its stored header in one
+    vectorized pass and write back only the rows that changed.
+    """
+    db = request.app.state.db
+    rows = db.get_benchmark_difficulty_inputs()
+    if not rows:
+        return {"total": 0, "updated": 0}
+    
+    ids, nvars, ratios, current = zip(*rows)
+    new = estimate_difficulty_bulk(np.array(nvars, dtype=float), np.array(ratios, dtype=float))
+    changed = np.flatnonzero(new != np.array(current, dtype=object))
+    updates = [(str(new[i]), ids[i]) for i in changed]
+    if updates:
+        db.update_benchmark_difficulties(updates)
+    return {"total": len(ids), "updated": len(updates)}
+
+
+@router.post("/clean-invalid")
+async def clean_invalid_benchmarks(
+    request: Request,
+    unknown_family: bool = False,
+    unknown_difficulty: bool = False,
+    chunk_size: int = Query(500, ge=1, le=5000),
+) -> Dict:
+    """
+    Delete invalid benchmarks in fixed-size chunks (one transaction each), so a
+    large cleanup never holds the write lock for the whole table at once.
+    """
+    db = request.app.state.db
+    invalid = _filter_invalid(db.find_invalid_benchmarks(), unknown_family, unknown_difficulty)
+    ids = [b['id'] for b in invalid]
+    total = len(ids)
+    
+    summary = {"requested": total, "deleted": 0, "deleted_ids": [], "skipped_with_runs": [], "not_found": 0}
+    for start in range(0, total, chunk_size):
+        result = db.delete_benchmarks_batch(ids[start:start + chunk_size], chunk_size=chunk_size)
+        summary["deleted"] += result["deleted"]
+        summary["not_found"] += result["not_found"]
+        summary["deleted_ids"].extend(result["deleted_ids"])
+        summary["skipped_with_runs"].extend(result["skipped_with_runs"])
+        logger.info("Clean invalid: processed %d/%d", min(start + chunk_size, total), total)
+    
+    return summary
+
+
 @router.post("/upload")
 async def upload_benchmarks(
     files: List[UploadFile] = File(...),
     request: Request = None
 ) -> Dict:
     """Upload CNF benchmark files"""
+    import aiofiles
     from app.core.config import settings
     
     db = request.app.state.db
@@ -223,6 +773,8 @@ async def upload_benchmarks(
         "skipped": []
     }
     
+    # 1. Guardar todos los archivos (I/O) antes de parsear
+    saved = {}
     for file in files:
         if not file.filename.endswith('.cnf'):
             results["failed"].append({
@@ -232,53 +784,60 @@ async def upload_benchmarks(
             continue
         
         try:
-            # Save file
             filepath = benchmarks_dir / file.filename
-            with open(filepath, 'wb') as f:
-                content = await file.read()
-                f.write(content)
-            
-            # Parse metadata
-            metadata = parse_cnf_header(str(filepath))
-            family = classify_family(file.filename)
-            difficulty = estimate_difficulty(
-                metadata.get('num_variables'),
-                metadata.get('num_clauses'),
-                metadata.get('clause_variable_ratio')
-            )
-            checksum = get_file_checksum(str(filepath))
-            
-            # Add to database
+            # Copia por bloques sin bloquear el event loop ni cargar el fichero entero
+            async with aiofiles.open(filepath, 'wb') as f:
+                while chunk := await file.read(1 << 20):
+                    await f.write(chunk)
+            saved[str(filepath)] = file.filename
+        except Exception as e:
+            results["failed"].append({
+                "filename": file.filename,
+                "error": str(e)
+            })
+    
+    # 2. Parsear en paralelo (en un hilo, sin bloquear el event loop) y registrar
+    parsed = await asyncio.to_thread(parse_many, list(saved))
+    for filepath, metadata, error in parsed:
+        filename = saved[filepath]
+        if error is not None:
+            results["failed"].append({
+                "filename": filename,
+                "error": str(error)
+            })
+            continue
+        
+        try:
             benchmark_id = db.add_benchmark(
-                filename=file.filename,
-                filepath=str(filepath),
-                family=family,
-                size_bytes=os.path.getsize(filepath),
+                filename=filename,
+                filepath=filepath,
+                family=metadata['family'],
+                size_bytes=metadata['size_bytes'],
                 num_variables=metadata.get('num_variables'),
                 num_clauses=metadata.get('num_clauses'),
                 clause_variable_ratio=metadata.get('clause_variable_ratio'),
-                difficulty=difficulty,
-                checksum=checksum
+                difficulty=metadata['difficulty'],
+                checksum=metadata['checksum']
             )
             
             if benchmark_id:
                 results["success"].append({
                     "id": benchmark_id,
-                    "filename": file.filename,
-                    "family": family,
-                    "difficulty": difficulty,
+                    "filename": filename,
+                    "family": metadata['family'],
+                    "difficulty": metadata['difficulty'],
                     "variables": metadata.get('num_variables'),
                     "clauses": metadata.get('num_clauses')
                 })
             else:
                 results["skipped"].append({
-                    "filename": file.filename,
+                    "filename": filename,
                     "reason": "Already exists"
                 })
                 
         except Exception as e:
             results["failed"].append({
-                "filename": file.filename,
+                "filename": filename,
                 "error": str(e)
             })
     
@@ -300,38 +859,46 @@ async def scan_directory(
     if not scan_dir.exists():
         raise HTTPException(status_code=400, detail="Directory does not exist")
     
-    # Find all CNF files
-    cnf_files = list(scan_dir.rglob('*.cnf'))
+    # Recorrido en streaming: solo se guardan las rutas nuevas, no todos los Path.
+    # Los ya registrados (filename es UNIQUE) se omiten sin leerlos ni hashearlos
+    known = db.get_benchmark_filenames()
+    found = 0
+    new_files = []
+    for p in scan_dir.rglob('*.cnf'):
+        found += 1
+        if p.name not in known:
+            new_files.append(str(p))
     
-    if not cnf_files:
+    if not found:
         return {
             "message": "No CNF files found",
             "directory": str(scan_dir),
             "imported": 0
         }
     
-    # Import files
+    # Import files (parsing en paralelo, inserción en el hilo principal);
+    # en montajes de red la lectura asíncrona solapa la latencia de cada fichero
+    if settings.BENCHMARK_PARSE_ASYNC_IO:
+        parsed = await parse_many_async(new_files, settings.BENCHMARK_PARSE_ASYNC_CONCURRENCY)
+    else:
+        parsed = await asyncio.to_thread(parse_many, new_files)
+    
     imported = 0
-    for filepath in cnf_files:
+    for filepath, metadata, error in parsed:
+        if error is not None:
+            logger.error(f"Error importing {filepath}: {error}")
+            continue
         try:
-            metadata = parse_cnf_header(str(filepath))
-            family = classify_family(filepath.name)
-            difficulty = estimate_difficulty(
-                metadata.get('num_variables'),
-                metadata.get('num_clauses'),
-                metadata.get('clause_variable_ratio')
-            )
-            
             benchmark_id = db.add_benchmark(
-                filename=filepath.name,
-                filepath=str(filepath),
-                family=family,
-                size_bytes=filepath.stat().st_size,
+                filename=os.path.basename(filepath),
+                filepath=filepath,
+                family=metadata['family'],
+                size_bytes=metadata['size_bytes'],
                 num_variables=metadata.get('num_variables'),
                 num_clauses=metadata.get('num_clauses'),
                 clause_variable_ratio=metadata.get('clause_variable_ratio'),
-                difficulty=difficulty,
-                checksum=get_file_checksum(str(filepath))
+                difficulty=metadata['difficulty'],
+                checksum=metadata['checksum']
             )
             
             if benchmark_id:
@@ -343,7 +910,7 @@ async def scan_directory(
     return {
         "message": f"Imported {imported} benchmarks",
         "directory": str(scan_dir),
-        "found": len(cnf_files),
+        "found": found,
         "imported": imported,
-        "skipped": len(cnf_files) - imported
+        "skipped": found - imported
     }
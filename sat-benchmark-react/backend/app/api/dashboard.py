@@ -2,11 +2,9 @@
 Dashboard API endpoints
 """
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Request
 from typing import Dict
 from app.solvers import solver_registry
-from pathlib import Path
-import os
 
 router = APIRouter()
 
@@ -29,10 +27,11 @@ async def get_recent_activity(request: Request, limit: int = 10) -> Dict:
     """Get recent experiments and runs"""
     db = request.app.state.db
     
-    experiments = db.get_experiments()[:limit]
+    # Una sola lectura (cacheada) de experimentos y COUNT(*) en vez de cargar todas las runs
+    experiments = db.get_experiments()
     
     return {
-        "recent_experiments": experiments,
-        "total_experiments": len(db.get_experiments()),
-        "total_runs": len(db.get_all_runs()) if db.has_data() else 0
+        "recent_experiments": experiments[:limit],
+        "total_experiments": len(experiments),
+        "total_runs": db.count_runs()
     }
@@ -2,20 +2,18 @@
 Experiments API endpoints
 """
 
-from fastapi import APIRouter, Depends, Request, HTTPException, BackgroundTasks, WebSocket
+from fastapi import APIRouter, Request, Response, HTTPException, BackgroundTasks, WebSocket, Query
 from pydantic import BaseModel
 from typing import Optional, List, Dict
 from datetime import datetime
 import asyncio
-import subprocess
-import psutil
 import time
-import os
 import json
 import logging
 
-from .solvers import PRE_CONFIGURED_SOLVERS, get_solver_by_id
+from .solvers import get_solver_by_id
 from app.solvers import solver_registry
+from app.core.utils import parse_id_ranges
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +29,14 @@ class ExperimentCreate(BaseModel):
     memory_limit_mb: int = 8192
     parallel_jobs: int = 1
     solver_ids: List[int]
-    benchmark_ids: List[int]
+    benchmark_ids: List[int] = []
+    # Selección por familia / dificultad (se une a benchmark_ids)
+    families: Optional[List[str]] = None
+    difficulties: Optional[List[str]] = None
+
+
+class ExperimentBatchDelete(BaseModel):
+    ids: str  # e.g. "1-10, 15"
 
 
 class ExperimentUpdate(BaseModel):
@@ -46,6 +51,11 @@ class ExperimentUpdate(BaseModel):
 
 active_experiments: Dict[int, Dict] = {}
 
+# Cada escritura invalida las caches de lectura (get_data_version), así que los
+# contadores de progreso viven en active_experiments y se persisten como mucho
+# una vez por intervalo (y siempre al terminar).
+PROGRESS_FLUSH_SECONDS = 2.0
+
 
 # ==================== ENDPOINTS ====================
 
@@ -60,6 +70,17 @@ async def list_experiments(
     return db.get_experiments(status=status)
 
 
+@router.get("/delete-preview")
+async def preview_experiments_delete(request: Request, ids: str) -> Dict:
+    """Totals for an ID spec ('1-10, 15') before deleting, aggregated in SQL"""
+    db = request.app.state.db
+    try:
+        experiment_ids = parse_id_ranges(ids)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid ID list: {ids}")
+    return db.get_experiment_delete_preview(experiment_ids)
+
+
 @router.get("/{experiment_id}")
 async def get_experiment(experiment_id: int, request: Request) -> Dict:
     """Get a specific experiment with details"""
@@ -69,16 +90,11 @@ async def get_experiment(experiment_id: int, request: Request) -> Dict:
     if not experiment:
         raise HTTPException(status_code=404, detail="Experiment not found")
     
-    # Add run statistics
-    runs = db.get_runs(experiment_id=experiment_id)
-    
-    result_counts = {}
-    for run in runs:
-        result = run.get('result', 'UNKNOWN')
-        result_counts[result] = result_counts.get(result, 0) + 1
+    # Add run statistics (agregadas en SQL, sin cargar las runs)
+    result_counts = db.get_result_distribution(experiment_id)
     
     experiment['result_distribution'] = result_counts
-    experiment['runs_count'] = len(runs)
+    experiment['runs_count'] = sum(result_counts.values())
     
     return experiment
 
@@ -94,10 +110,20 @@ async def create_experiment(exp: ExperimentCreate, request: Request) -> Dict:
         if not solver:
             raise HTTPException(status_code=400, detail=f"Solver {solver_id} not found in pre-configured solvers")
     
-    # Validate benchmarks exist
-    for benchmark_id in exp.benchmark_ids:
-        if not db.get_benchmark(benchmark_id):
-            raise HTTPException(status_code=400, detail=f"Benchmark {benchmark_id} not found")
+    # Expand family/difficulty selections with the same helper as GET /benchmarks/ids
+    benchmark_ids = list(exp.benchmark_ids)
+    for column, selected in (('family', exp.families), ('difficulty', exp.difficulties)):
+        if selected:
+            benchmark_ids.extend(db.get_benchmark_ids_by(column, selected))
+    exp.benchmark_ids = list(dict.fromkeys(benchmark_ids))
+    if not exp.benchmark_ids:
+        raise HTTPException(status_code=400, detail="No benchmarks selected")
+    
+    # Validate benchmarks exist (one IN query instead of one lookup per id)
+    existing = db.get_existing_benchmark_ids(exp.benchmark_ids)
+    missing = next((b for b in exp.benchmark_ids if b not in existing), None)
+    if missing is not None:
+        raise HTTPException(status_code=400, detail=f"Benchmark {missing} not found")
     
     total_runs = len(exp.solver_ids) * len(exp.benchmark_ids)
     
@@ -161,6 +187,22 @@ async def delete_experiment(experiment_id: int, request: Request) -> Dict:
     return {"message": "Experiment deleted successfully"}
 
 
+@router.post("/delete-batch")
+async def delete_experiments_batch(body: ExperimentBatchDelete, request: Request) -> Dict:
+    """Delete several experiments (and their runs) given an ID spec with ranges"""
+    db = request.app.state.db
+    try:
+        ids = parse_id_ranges(body.ids)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid ID list: {body.ids}")
+    
+    for experiment_id in ids:
+        if experiment_id in active_experiments:
+            active_experiments[experiment_id]['stop'] = True
+    
+    return db.delete_experiments(ids)
+
+
 @router.post("/{experiment_id}/start")
 async def start_experiment(
     experiment_id: int,
@@ -185,20 +227,23 @@ async def start_experiment(
     if not solver_ids or not benchmark_ids:
         raise HTTPException(status_code=400, detail="No solvers or benchmarks configured")
     
+    # Un solo instante de inicio para la memoria y la base de datos
+    started_at = datetime.now().isoformat()
+    
     # Initialize tracking
     active_experiments[experiment_id] = {
         'stop': False,
         'progress': 0,
         'current_solver': None,
         'current_benchmark': None,
-        'started_at': datetime.now().isoformat()
+        'started_at': started_at
     }
     
     # Update status
     db.update_experiment(
         experiment_id,
         status='running',
-        started_at=datetime.now().isoformat()
+        started_at=started_at
     )
     
     # Start background execution
@@ -243,14 +288,17 @@ async def get_experiment_progress(experiment_id: int, request: Request) -> Dict:
         raise HTTPException(status_code=404, detail="Experiment not found")
     
     progress_data = active_experiments.get(experiment_id, {})
+    # Mientras corre, los contadores en memoria van por delante de la BD
+    completed_runs = progress_data.get('completed_runs', experiment['completed_runs'])
+    failed_runs = progress_data.get('failed_runs', experiment['failed_runs'])
     
     return {
         "experiment_id": experiment_id,
         "status": experiment['status'],
         "total_runs": experiment['total_runs'],
-        "completed_runs": experiment['completed_runs'],
-        "failed_runs": experiment['failed_runs'],
-        "progress_percent": (experiment['completed_runs'] / experiment['total_runs'] * 100) if experiment['total_runs'] > 0 else 0,
+        "completed_runs": completed_runs,
+        "failed_runs": failed_runs,
+        "progress_percent": (completed_runs / experiment['total_runs'] * 100) if experiment['total_runs'] > 0 else 0,
         "current_solver": progress_data.get('current_solver'),
         "current_benchmark": progress_data.get('current_benchmark'),
         "started_at": experiment.get('started_at'),
@@ -259,10 +307,20 @@ async def get_experiment_progress(experiment_id: int, request: Request) -> Dict:
 
 
 @router.get("/{experiment_id}/runs")
-async def get_experiment_runs(experiment_id: int, request: Request) -> List[Dict]:
-    """Get all runs for an experiment"""
+async def get_experiment_runs(
+    experiment_id: int,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=10000),
+    offset: int = Query(0, ge=0),
+) -> List[Dict]:
+    """Get runs for an experiment; with limit/offset only that page is fetched (total in X-Total-Count)"""
     db = request.app.state.db
-    return db.get_runs(experiment_id=experiment_id)
+    if limit is None and not offset:
+        return db.get_runs(experiment_id=experiment_id)
+    
+    response.headers["X-Total-Count"] = str(db.count_runs(experiment_id))
+    return db.get_runs(experiment_id=experiment_id, limit=limit, offset=offset)
 
 
 # ==================== BACKGROUND TASK ====================
@@ -278,34 +336,62 @@ async def run_experiment_task(
     """Background task to run experiment"""
     completed = 0
     failed = 0
+    total_runs = len(solver_ids) * len(benchmark_ids)
+    last_flush = time.monotonic()
+    # Runs pendientes de guardar: se insertan por lotes junto con el progreso
+    pending_runs: List[Dict] = []
+    
+    def flush_runs():
+        if not pending_runs:
+            return
+        try:
+            db.add_runs_bulk(pending_runs)
+            logger.debug("Saved %d runs for exp=%s", len(pending_runs), experiment_id)
+        except Exception as bulk_error:
+            # El lote es una transacción: una fila mala lo revierte entero.
+            # Se reintenta fila a fila y solo se pierden las que fallan.
+            logger.warning("Bulk save of %d runs failed (%s), retrying one by one",
+                           len(pending_runs), bulk_error)
+            for run in pending_runs:
+                try:
+                    db.add_run(**run)
+                except Exception as save_error:
+                    logger.error("Failed to save run solver=%s benchmark=%s: %s",
+                                 run.get('solver_id'), run.get('benchmark_id'), save_error)
+        pending_runs.clear()
     
-    logger.info(f"Starting experiment {experiment_id} with solvers {solver_ids} and benchmarks {benchmark_ids}")
+    # Formato perezoso (%-style): el mensaje solo se construye si el nivel está activo
+    logger.info("Starting experiment %s with solvers %s and %d benchmarks",
+                experiment_id, solver_ids, len(benchmark_ids))
     
     try:
+        # Benchmarks indexados una vez por id (antes: un SELECT por benchmark y solver)
+        benchmarks = db.get_benchmarks_by_ids(benchmark_ids)
+        
         for solver_id in solver_ids:
             # Use plugin registry to get the solver
             plugin = solver_registry.get_by_id(solver_id)
             solver = get_solver_by_id(solver_id)
-            logger.info(f"Processing solver_id={solver_id}, found={solver is not None}")
+            logger.info("Processing solver_id=%s, found=%s", solver_id, solver is not None)
             
             if not solver or solver['status'] != 'ready':
-                logger.warning(f"Solver {solver_id} not found or not ready, skipping")
+                logger.warning("Solver %s not found or not ready, skipping", solver_id)
                 continue
             
             # Verify executable exists
             if not plugin or not plugin.is_installed():
-                logger.warning(f"Solver executable not found for {solver.get('name', solver_id)}, skipping")
+                logger.warning("Solver executable not found for %s, skipping", solver.get('name', solver_id))
                 continue
             
-            logger.info(f"Running solver {solver['name']} on {len(benchmark_ids)} benchmarks")
+            logger.info("Running solver %s on %d benchmarks", solver['name'], len(benchmark_ids))
             
             for benchmark_id in benchmark_ids:
                 # Check stop signal
                 if active_experiments.get(experiment_id, {}).get('stop'):
-                    logger.info(f"Experiment {experiment_id} stopped by user")
+                    logger.info("Experiment %s stopped by user", experiment_id)
                     break
                 
-                benchmark = db.get_benchmark(benchmark_id)
+                benchmark = benchmarks.get(benchmark_id)
                 if not benchmark:
                     continue
                 
@@ -322,47 +408,64 @@ async def run_experiment_task(
                 )
                 result = run_result.to_dict()
                 
-                logger.info(f"Solver {solver['name']} on {benchmark['filename']}: {result['result']} in {result['wall_time_seconds']:.2f}s")
+                logger.info("Solver %s on %s: %s in %.2fs", solver['name'], benchmark['filename'],
+                            result['result'], result['wall_time_seconds'])
                 
-                # Save result
-                try:
-                    db.add_run(
-                        experiment_id=experiment_id,
-                        solver_id=solver_id,
-                        benchmark_id=benchmark_id,
-                        **result
-                    )
-                    logger.info(f"Run saved successfully for exp={experiment_id}, solver={solver_id}, benchmark={benchmark_id}")
-                except Exception as save_error:
-                    logger.error(f"Failed to save run: {save_error}")
+                # Save result (batched, flushed with the progress counters)
+                pending_runs.append(dict(
+                    experiment_id=experiment_id,
+                    solver_id=solver_id,
+                    benchmark_id=benchmark_id,
+                    **result
+                ))
                 
                 if result['result'] in ['SAT', 'UNSAT']:
                     completed += 1
                 else:
                     failed += 1
                 
-                # Update experiment progress
-                db.update_experiment(
-                    experiment_id,
-                    completed_runs=completed,
-                    failed_runs=failed
-                )
+                # Live progress in memory; DB flush throttled
+                if experiment_id in active_experiments:
+                    active_experiments[experiment_id].update(
+                        completed_runs=completed,
+                        failed_runs=failed,
+                        progress=(completed + failed) / total_runs * 100 if total_runs else 0
+                    )
+                if time.monotonic() - last_flush >= PROGRESS_FLUSH_SECONDS:
+                    flush_runs()
+                    db.update_experiment(
+                        experiment_id,
+                        completed_runs=completed,
+                        failed_runs=failed
+                    )
+                    last_flush = time.monotonic()
             
             if active_experiments.get(experiment_id, {}).get('stop'):
                 break
         
-        # Mark complete
+        # Mark complete (final counters in the same write)
+        flush_runs()
         db.update_experiment(
             experiment_id,
             status='completed',
+            completed_runs=completed,
+            failed_runs=failed,
             completed_at=datetime.now().isoformat()
         )
         
     except Exception as e:
-        logger.error(f"Experiment {experiment_id} error: {e}")
-        db.update_experiment(experiment_id, status='error')
+        logger.error("Experiment %s error: %s", experiment_id, e)
+        flush_runs()
+        db.update_experiment(
+            experiment_id,
+            status='error',
+            completed_runs=completed,
+            failed_runs=failed
+        )
     
     finally:
+        # CancelledError (shutdown/reload) no es Exception: no perder el lote pendiente
+        flush_runs()
         # Clean up tracking
         if experiment_id in active_experiments:
             del active_experiments[experiment_id]
@@ -14,12 +14,13 @@ Todos los endpoints reciben experiment_id y timeout para configurar el análisis
 
 from fastapi import APIRouter, Request, HTTPException, Query
 from fastapi.responses import HTMLResponse, Response, StreamingResponse
-from typing import Optional, List
 import numpy as np
 import pandas as pd
 import logging
 import math
 import io
+from collections import OrderedDict
+from functools import lru_cache
 
 from app.analysis import (
     StatisticalTestSuite,
@@ -33,6 +34,11 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Cache LRU de gráficos base64: generar las figuras con matplotlib es lo más
+# caro del análisis y el frontend las vuelve a pedir al cambiar de pestaña.
+_PLOT_CACHE: "OrderedDict[tuple, object]" = OrderedDict()
+_PLOT_CACHE_MAX = 64
+
 
 # ==================== HELPERS ====================
 
@@ -205,6 +211,39 @@ def _get_experiment_data(db, experiment_id: int, timeout: float) -> dict:
     }
 
 
+# Los motores de métricas, tests y gráficos no guardan estado entre llamadas,
+# así que se comparten entre requests. BootstrapEngine NO: su RandomState
+# sembrado debe empezar de cero en cada request para ser reproducible.
+
+@lru_cache(maxsize=None)
+def _viz_engine() -> SATVisualizationEngine:
+    return SATVisualizationEngine()
+
+
+@lru_cache(maxsize=None)
+def _test_suite() -> StatisticalTestSuite:
+    return StatisticalTestSuite()
+
+
+@lru_cache(maxsize=32)
+def _metrics_engine(timeout: float) -> BenchmarkMetrics:
+    return BenchmarkMetrics(timeout=timeout)
+
+
+def _plot_cache_get(key: tuple):
+    value = _PLOT_CACHE.get(key)
+    if value is not None:
+        _PLOT_CACHE.move_to_end(key)
+    return value
+
+
+def _plot_cache_put(key: tuple, value) -> None:
+    _PLOT_CACHE[key] = value
+    _PLOT_CACHE.move_to_end(key)
+    while len(_PLOT_CACHE) > _PLOT_CACHE_MAX:
+        _PLOT_CACHE.popitem(last=False)
+
+
 # ==================== ENDPOINTS ====================
 
 @router.get("/full-analysis/{experiment_id}")
@@ -236,11 +275,11 @@ async def full_analysis(
     }
     
     # 1. Metrics
-    metrics = BenchmarkMetrics(timeout=timeout)
+    metrics = _metrics_engine(timeout)
     result["metrics"] = _safe(_normalize_metrics(metrics.compute_all_metrics(data["normalized_runs"])))
     
     # 2. Statistical tests
-    test_suite = StatisticalTestSuite()
+    test_suite = _test_suite()
     
     if len(data["solvers"]) >= 3:
         # Multi-solver analysis
@@ -280,7 +319,7 @@ async def get_metrics(
     db = request.app.state.db
     data = _get_experiment_data(db, experiment_id, timeout)
     
-    metrics = BenchmarkMetrics(timeout=timeout)
+    metrics = _metrics_engine(timeout)
     return _safe(_normalize_metrics(metrics.compute_all_metrics(data["normalized_runs"])))
 
 
@@ -294,7 +333,7 @@ async def get_statistical_tests(
     db = request.app.state.db
     data = _get_experiment_data(db, experiment_id, timeout)
     
-    test_suite = StatisticalTestSuite()
+    test_suite = _test_suite()
     
     if len(data["solvers"]) >= 3:
         return _safe(test_suite.full_multi_solver_analysis(data["time_matrix"]))
@@ -344,12 +383,19 @@ async def get_plots(
     survival, PAR-2 bar chart, heatmap, critical difference diagram.
     """
     db = request.app.state.db
+    
+    # La clave usa la versión de la DB (PRAGMA data_version, O(1)): un hit no lee runs
+    cache_key = (experiment_id, timeout, "__all__", db.get_data_version())
+    plots = _plot_cache_get(cache_key)
+    if plots is not None:
+        return {"plots": plots, "plot_names": list(plots.keys())}
+    
     data = _get_experiment_data(db, experiment_id, timeout)
     
-    viz = SATVisualizationEngine()
+    viz = _viz_engine()
     
     # Compute PAR-2 for bar chart
-    metrics = BenchmarkMetrics(timeout=timeout)
+    metrics = _metrics_engine(timeout)
     all_metrics = _normalize_metrics(metrics.compute_all_metrics(data["normalized_runs"]))
     par2_scores = all_metrics.get("par2_scores", all_metrics.get("par_scores", {}).get("par2", {}))
     
@@ -358,7 +404,7 @@ async def get_plots(
     cd = None
     
     if len(data["solvers"]) >= 3:
-        test_suite = StatisticalTestSuite()
+        test_suite = _test_suite()
         friedman = test_suite.friedman_test(data["time_matrix"])
         if friedman.significant_005:
             nemenyi = test_suite.nemenyi_post_hoc(data["time_matrix"])
@@ -373,6 +419,7 @@ async def get_plots(
         cd=cd,
         timeout=timeout,
     )
+    _plot_cache_put(cache_key, plots)
     
     return {"plots": plots, "plot_names": list(plots.keys())}
 
@@ -386,9 +433,15 @@ async def get_single_plot(
 ):
     """📊 Genera un gráfico específico como imagen base64."""
     db = request.app.state.db
+    
+    cache_key = (experiment_id, timeout, plot_name, db.get_data_version())
+    img = _plot_cache_get(cache_key)
+    if img is not None:
+        return {"plot_name": plot_name, "image": img}
+    
     data = _get_experiment_data(db, experiment_id, timeout)
     
-    viz = SATVisualizationEngine()
+    viz = _viz_engine()
     
     if plot_name == "cactus":
         img = viz.cactus_plot(data["raw_solver_times"], timeout)
@@ -401,7 +454,7 @@ async def get_single_plot(
     elif plot_name == "survival":
         img = viz.survival_plot(data["raw_solver_times"], timeout)
     elif plot_name == "par2_bar":
-        metrics = BenchmarkMetrics(timeout=timeout)
+        metrics = _metrics_engine(timeout)
         all_metrics = _normalize_metrics(metrics.compute_all_metrics(data["normalized_runs"]))
         img = viz.par2_bar_chart(all_metrics.get("par_scores", {}).get("par2", {}))
     elif plot_name.startswith("scatter_"):
@@ -418,6 +471,8 @@ async def get_single_plot(
     else:
         raise HTTPException(400, f"Unknown plot: {plot_name}. Available: cactus, ecdf, boxplot, performance_profile, survival, par2_bar, scatter_<A>_vs_<B>")
     
+    if img:
+        _plot_cache_put(cache_key, img)
     return {"plot_name": plot_name, "image": img}
 
 
@@ -439,11 +494,11 @@ async def get_report_html(
     exp = data["experiment"]
     
     # 1. Metrics
-    metrics_engine = BenchmarkMetrics(timeout=timeout)
+    metrics_engine = _metrics_engine(timeout)
     metrics = _normalize_metrics(metrics_engine.compute_all_metrics(data["normalized_runs"]))
     
     # 2. Statistical tests
-    test_suite = StatisticalTestSuite()
+    test_suite = _test_suite()
     if len(data["solvers"]) >= 3:
         stat_tests = test_suite.full_multi_solver_analysis(data["time_matrix"])
     elif len(data["solvers"]) == 2:
@@ -465,7 +520,7 @@ async def get_report_html(
         bootstrap_results = {"error": str(e)}
     
     # 4. Plots
-    viz = SATVisualizationEngine()
+    viz = _viz_engine()
     avg_ranks = None
     cd = None
     if len(data["solvers"]) >= 3 and isinstance(stat_tests, dict):
@@ -549,7 +604,7 @@ async def get_normality_tests(
     db = request.app.state.db
     data = _get_experiment_data(db, experiment_id, timeout)
     
-    test_suite = StatisticalTestSuite()
+    test_suite = _test_suite()
     results = {}
     
     for solver in data["solvers"]:
@@ -569,7 +624,7 @@ async def get_effect_sizes(
     db = request.app.state.db
     data = _get_experiment_data(db, experiment_id, timeout)
     
-    test_suite = StatisticalTestSuite()
+    test_suite = _test_suite()
     results = {}
     solvers = data["solvers"]
     
@@ -615,7 +670,7 @@ async def export_csv(
     output = io.StringIO()
     
     if table_name == "metrics_ranking":
-        metrics_engine = BenchmarkMetrics(timeout=timeout)
+        metrics_engine = _metrics_engine(timeout)
         metrics = _normalize_metrics(metrics_engine.compute_all_metrics(data["normalized_runs"]))
         ranking = metrics.get("ranking", [])
         rows = []
@@ -631,7 +686,7 @@ async def export_csv(
         pd.DataFrame(rows).to_csv(output, index=False)
 
     elif table_name == "par2_scores":
-        metrics_engine = BenchmarkMetrics(timeout=timeout)
+        metrics_engine = _metrics_engine(timeout)
         metrics = _normalize_metrics(metrics_engine.compute_all_metrics(data["normalized_runs"]))
         par2 = metrics.get("par2_scores", {})
         par10 = metrics.get("par10_scores", {})
@@ -641,7 +696,7 @@ async def export_csv(
         pd.DataFrame(rows).to_csv(output, index=False)
 
     elif table_name == "normality":
-        test_suite = StatisticalTestSuite()
+        test_suite = _test_suite()
         rows = []
         for solver in data["solvers"]:
             times = np.array(data["solver_times"][solver])
@@ -669,7 +724,7 @@ async def export_csv(
     elif table_name == "friedman":
         if len(data["solvers"]) < 3:
             raise HTTPException(400, "Friedman requires ≥ 3 solvers")
-        test_suite = StatisticalTestSuite()
+        test_suite = _test_suite()
         friedman = test_suite.friedman_test(data["time_matrix"])
         fd = friedman.to_dict()
         rows = [fd]
@@ -678,7 +733,7 @@ async def export_csv(
     elif table_name == "nemenyi":
         if len(data["solvers"]) < 3:
             raise HTTPException(400, "Nemenyi requires ≥ 3 solvers")
-        test_suite = StatisticalTestSuite()
+        test_suite = _test_suite()
         friedman = test_suite.friedman_test(data["time_matrix"])
         if not friedman.significant_005:
             raise HTTPException(400, "Friedman not significant; Nemenyi not applicable")
@@ -689,7 +744,7 @@ async def export_csv(
     elif table_name == "corrections":
         if len(data["solvers"]) < 3:
             raise HTTPException(400, "Corrections require ≥ 3 solvers for pairwise tests")
-        test_suite = StatisticalTestSuite()
+        test_suite = _test_suite()
         multi = test_suite.full_multi_solver_analysis(data["time_matrix"])
         mc = multi.get("multiple_corrections", {})
         if not mc:
@@ -713,7 +768,7 @@ async def export_csv(
         pd.DataFrame(rows).to_csv(output, index=False)
 
     elif table_name == "effect_sizes":
-        test_suite = StatisticalTestSuite()
+        test_suite = _test_suite()
         rows = []
         solvers = data["solvers"]
         for i, s1 in enumerate(solvers):
@@ -779,7 +834,7 @@ async def export_csv(
         pd.DataFrame(rows).to_csv(output, index=False)
 
     elif table_name == "full_statistical_tests":
-        test_suite = StatisticalTestSuite()
+        test_suite = _test_suite()
         if len(data["solvers"]) >= 3:
             multi = test_suite.full_multi_solver_analysis(data["time_matrix"])
             # Export ranking + friedman + corrections as multi-sheet workaround
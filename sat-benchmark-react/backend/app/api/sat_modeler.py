@@ -35,9 +35,6 @@ import asyncio
 import json
 import logging
 import os
-import re
-import subprocess
-import tempfile
 import time
 import uuid
 from datetime import datetime
@@ -45,7 +42,7 @@ from itertools import combinations
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
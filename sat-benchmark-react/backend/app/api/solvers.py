@@ -8,7 +8,6 @@ generated automatically from ``solver_definitions.yaml``.
 from fastapi import APIRouter, Request, HTTPException
 from pydantic import BaseModel
 from typing import Optional, List, Dict
-from pathlib import Path
 import os
 import logging
 
@@ -2,8 +2,6 @@ from fastapi import APIRouter, BackgroundTasks, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Any
 
-from app.analysis.tuning import AlgorithmTuner
-
 router = APIRouter(
     tags=["Algorithm Configuration"]
 )
@@ -27,6 +25,9 @@ ABLATION_JOBS = {}
 def execute_tuning_task(job_id: str, req: TuningRequest):
     try:
         TUNING_JOBS[job_id]["status"] = "running"
+        # SMAC/ConfigSpace son pesados: se importan al lanzar el job, no al arrancar
+        from app.analysis.tuning import AlgorithmTuner
+        
         tuner = AlgorithmTuner(
             solver_name=req.solver_name,
             instances=req.instances,
@@ -1,3 +1,5 @@
 # Core modules
 from .database import DatabaseManager
 from .config import settings
+
+__all__ = ["DatabaseManager", "settings"]
@@ -5,7 +5,6 @@ Application Configuration
 from pydantic_settings import BaseSettings
 from pathlib import Path
 from typing import List
-import yaml
 import os
 
 
@@ -39,6 +38,20 @@ class Settings(BaseSettings):
     DEFAULT_MEMORY_LIMIT: int = 8192
     DEFAULT_PARALLEL_JOBS: int = 4
     
+    # Import de benchmarks: 0 workers = os.cpu_count(); procesos por defecto
+    # porque el parseo + checksum es CPU-bound (los threads quedan como fallback)
+    BENCHMARK_PARSE_WORKERS: int = 0
+    BENCHMARK_PARSE_USE_PROCESSES: bool = True
+    # Por debajo de este número de ficheros se usan hilos (no compensa el IPC)
+    BENCHMARK_PARSE_PROCESS_MIN_FILES: int = 32
+    # Benchmarks en NFS/SSHFS: lectura con asyncio + aiofiles (limitada a N ficheros abiertos)
+    BENCHMARK_PARSE_ASYNC_IO: bool = False
+    BENCHMARK_PARSE_ASYNC_CONCURRENCY: int = 64
+    
+    # Export CSV con el writer de pyarrow (más rápido, pero entrecomilla todos los
+    # strings y escribe true/false); por defecto pandas, mismo formato que df.to_csv
+    EXPORT_CSV_USE_ARROW: bool = False
+    
     # Benchmark families
     BENCHMARK_FAMILIES: dict = {
         "circuit": {
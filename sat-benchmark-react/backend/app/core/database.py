@@ -5,9 +5,11 @@ SQLite operations with SQLAlchemy support
 
 import sqlite3
 import logging
+import threading
 from pathlib import Path
-from datetime import datetime
 from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from collections import OrderedDict
 import json
 
 logger = logging.getLogger(__name__)
@@ -26,6 +28,90 @@ def _get_solver_names() -> dict:
 # Backwards-compatible alias
 PRE_CONFIGURED_SOLVER_NAMES = None  # will use _get_solver_names() dynamically
 
+# orjson es opcional: serializa más rápido que json y cae a stdlib si falta
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+
+def _json_dumps(obj: Any, default=None) -> str:
+    """Serialize to a JSON str (TEXT column), using orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default,
+                                option=orjson.OPT_NON_STR_KEYS).decode()
+        except orjson.JSONEncodeError:
+            pass  # p.ej. enteros > 64 bits; stdlib los acepta
+    return json.dumps(obj, default=default)
+
+
+# DELETE ... RETURNING existe desde SQLite 3.35
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# PRAGMAs por conexión (no se persisten en el fichero). synchronous=NORMAL es
+# seguro con WAL; cache de 64 MiB y lecturas mmap de hasta 256 MiB.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+    # ANALYZE automático (PRAGMA optimize) aproximado: nunca recorre tablas enteras
+    "PRAGMA analysis_limit=1000",
+)
+
+
+class _OptimizingConnection(sqlite3.Connection):
+    """
+    Connection that runs PRAGMA optimize before closing. SQLite then refreshes
+    planner statistics (sqlite_stat1) for the tables this connection queried,
+    only when they are missing or stale, so they follow the data as it grows.
+    """
+    
+    def close(self):
+        if not self.in_transaction:
+            try:
+                self.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass  # p.ej. otro escritor tiene el lock: se hará en un cierre posterior
+        super().close()
+
+
+def _like_substring(text: str) -> str:
+    """LIKE pattern for a literal, case-insensitive substring (escapes % and _)"""
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+# Campos de runs que add_run guarda en su columna (el resto va a extra_stats_json)
+RUN_FIELDS = frozenset({
+    'exit_code', 'verified', 'cpu_time_seconds', 'wall_time_seconds',
+    'user_time_seconds', 'system_time_seconds', 'max_memory_kb',
+    'avg_memory_kb', 'conflicts', 'decisions', 'propagations',
+    'restarts', 'learnt_clauses', 'deleted_clauses', 'hostname',
+    'solver_output', 'error_message', 'par2_score', 'extra_stats_json',
+})
+
+
+def _detached(value):
+    """Copy of a cached value down to its rows, so callers can mutate what they get"""
+    if isinstance(value, list):
+        return [dict(item) if isinstance(item, dict) else item for item in value]
+    if isinstance(value, dict):
+        return {k: v.copy() if isinstance(v, (list, dict)) else v for k, v in value.items()}
+    return value
+
+
+# Entradas del LRU de get_experiment_delete_preview
+DELETE_PREVIEW_CACHE_MAX = 64
+
+
+@lru_cache(maxsize=64)
+def _run_insert_sql(columns: tuple) -> str:
+    """INSERT for one column set, built once (runs share a handful of column sets)"""
+    placeholders = ', '.join('?' * len(columns))
+    return f"INSERT OR REPLACE INTO runs ({', '.join(columns)}) VALUES ({placeholders})"
+
 
 class DatabaseManager:
     """Manages SQLite database for experiments, solvers, benchmarks, and runs"""
@@ -33,19 +119,67 @@ class DatabaseManager:
     def __init__(self, db_path: str = "data/experiments.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Contador de escrituras de este proceso (invalida las caches de lectura)
+        self._write_generation = 0
+        self._read_cache: Dict[str, tuple] = {}
+        # Conexión solo para PRAGMA data_version (cambia con commits de otras conexiones)
+        self._version_conn: Optional[sqlite3.Connection] = None
+        self._version_lock = threading.Lock()
+        # LRU de previews de borrado por (versión de datos, IDs)
+        self._delete_previews: "OrderedDict[tuple, Dict]" = OrderedDict()
         self.init_database()
     
     def get_connection(self) -> sqlite3.Connection:
-        """Get database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
+        """Get database connection with row factory and tuned PRAGMAs"""
+        conn = sqlite3.connect(self.db_path, factory=_OptimizingConnection)
         conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         return conn
     
+    def _commit(self, conn: sqlite3.Connection):
+        """Commit and bump the write generation used by get_data_version()"""
+        conn.commit()
+        self._write_generation += 1
+    
+    def get_data_version(self) -> tuple:
+        """
+        O(1) fingerprint of the database contents for cache invalidation.
+        
+        Combines the in-process write generation with PRAGMA data_version read on
+        a long-lived connection: SQLite bumps it whenever any other connection
+        (another request, a script, a second worker) commits, UPDATEs included.
+        """
+        with self._version_lock:
+            if self._version_conn is None:
+                self._version_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            data_version = self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+        return (self._write_generation, data_version)
+    
+    def _cached_read(self, key: str, loader):
+        """
+        Return loader() memoized until get_data_version() changes.
+        
+        Callers get a copy (lists of rows / dicts of containers copied one level
+        down), so mutating the result never corrupts the cached value.
+        """
+        version = self.get_data_version()
+        cached = self._read_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return _detached(cached[1])
+        value = loader()
+        self._read_cache[key] = (version, value)
+        return _detached(value)
+    
     def init_database(self):
         """Initialize database schema"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        # WAL: las lecturas no bloquean a los escritores (y pueden ir en paralelo).
+        # El modo queda persistido en el fichero de la base de datos.
+        cursor.execute("PRAGMA journal_mode=WAL")
+        
         # Solvers Table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS solvers (
@@ -156,6 +290,8 @@ class DatabaseManager:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_runs_solver ON runs(solver_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_runs_benchmark ON runs(benchmark_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_benchmarks_family ON benchmarks(family)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_benchmarks_family_difficulty ON benchmarks(family, difficulty)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_benchmarks_checksum ON benchmarks(checksum)")
         
         # Migration: add extra_stats_json column if missing
         cursor.execute("PRAGMA table_info(runs)")
@@ -164,7 +300,7 @@ class DatabaseManager:
             cursor.execute("ALTER TABLE runs ADD COLUMN extra_stats_json TEXT")
             logger.info("Migration: added extra_stats_json column to runs table")
         
-        conn.commit()
+        self._commit(conn)
         conn.close()
         logger.info(f"Database initialized at {self.db_path}")
     
@@ -187,9 +323,9 @@ class DatabaseManager:
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (name, version, executable_path, source_path, compile_command,
                   run_command_template, description, status,
-                  json.dumps(metadata) if metadata else None))
+                  _json_dumps(metadata) if metadata else None))
             
-            conn.commit()
+            self._commit(conn)
             solver_id = cursor.lastrowid
             logger.info(f"Added solver: {name} (ID: {solver_id})")
             return solver_id
@@ -204,7 +340,11 @@ class DatabaseManager:
             conn.close()
     
     def get_solvers(self, status: str = None) -> List[Dict]:
-        """Get all solvers, optionally filtered by status"""
+        """Get all solvers, optionally filtered by status (cached until the data version changes)"""
+        return self._cached_read(f'solvers:{status or ""}', lambda: self._query_solvers(status))
+    
+    def _query_solvers(self, status: str = None) -> List[Dict]:
+        """Solvers, optionally filtered by status (uncached)"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
@@ -241,7 +381,7 @@ class DatabaseManager:
             if field in valid_fields:
                 updates.append(f"{field} = ?")
                 if field == 'metadata' and isinstance(value, dict):
-                    values.append(json.dumps(value))
+                    values.append(_json_dumps(value))
                 else:
                     values.append(value)
         
@@ -252,7 +392,7 @@ class DatabaseManager:
         query = f"UPDATE solvers SET {', '.join(updates)} WHERE id = ?"
         
         cursor.execute(query, values)
-        conn.commit()
+        self._commit(conn)
         success = cursor.rowcount > 0
         conn.close()
         return success
@@ -262,7 +402,7 @@ class DatabaseManager:
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute("DELETE FROM solvers WHERE id = ?", (solver_id,))
-        conn.commit()
+        self._commit(conn)
         success = cursor.rowcount > 0
         conn.close()
         return success
@@ -270,32 +410,45 @@ class DatabaseManager:
     # ==================== BENCHMARK OPERATIONS ====================
 
     def get_benchmark_aggregates(self) -> Dict:
-        """Get benchmark aggregate statistics using SQL (no full table scan)"""
+        """Get benchmark aggregate statistics (cached until the data version changes)"""
+        return self._cached_read('benchmark_aggregates', self._query_benchmark_aggregates)
+
+    def _query_benchmark_aggregates(self) -> Dict:
+        """
+        Benchmark aggregate statistics in a single scan: per-difficulty counts
+        and sums, plus completeness counters; totals/averages derived here.
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        # Total + averages in one query
         cursor.execute("""
-            SELECT COUNT(*) as total,
-                   COALESCE(AVG(num_variables), 0) as avg_variables,
-                   COALESCE(AVG(num_clauses), 0) as avg_clauses
+            SELECT COALESCE(difficulty, 'unknown') as difficulty,
+                   COUNT(*) as cnt,
+                   SUM(num_variables) as sum_variables, COUNT(num_variables) as n_variables,
+                   SUM(num_clauses) as sum_clauses, COUNT(num_clauses) as n_clauses,
+                   SUM(family IS NULL OR family IN ('other', 'unknown')) as unknown_family,
+                   SUM(checksum IS NULL) as missing_checksum
             FROM benchmarks
+            GROUP BY 1
         """)
-        row = dict(cursor.fetchone())
-
-        # Difficulty distribution
-        cursor.execute("""
-            SELECT COALESCE(difficulty, 'unknown') as difficulty, COUNT(*) as cnt
-            FROM benchmarks GROUP BY difficulty
-        """)
-        difficulty_distribution = {r['difficulty']: r['cnt'] for r in cursor.fetchall()}
-
+        rows = [dict(r) for r in cursor.fetchall()]
         conn.close()
+
+        total = sum(r['cnt'] for r in rows)
+        n_vars = sum(r['n_variables'] for r in rows)
+        n_clauses = sum(r['n_clauses'] for r in rows)
         return {
-            "total": row["total"],
-            "avg_variables": row["avg_variables"],
-            "avg_clauses": row["avg_clauses"],
-            "difficulty_distribution": difficulty_distribution,
+            "total": total,
+            "avg_variables": sum(r['sum_variables'] or 0 for r in rows) / n_vars if n_vars else 0,
+            "avg_clauses": sum(r['sum_clauses'] or 0 for r in rows) / n_clauses if n_clauses else 0,
+            "difficulty_distribution": {r['difficulty']: r['cnt'] for r in rows},
+            "completeness": {
+                "missing_variables": total - n_vars,
+                "missing_clauses": total - n_clauses,
+                "unknown_family": sum(r['unknown_family'] or 0 for r in rows),
+                "unknown_difficulty": next((r['cnt'] for r in rows if r['difficulty'] == 'unknown'), 0),
+                "missing_checksum": sum(r['missing_checksum'] or 0 for r in rows),
+            },
         }
 
     def get_benchmarks_paginated(self, family: str = None, difficulty: str = None,
@@ -315,8 +468,8 @@ class DatabaseManager:
             where_parts.append("difficulty = ?")
             params.append(difficulty)
         if search:
-            where_parts.append("filename LIKE ?")
-            params.append(f"%{search}%")
+            where_parts.append("filename LIKE ? ESCAPE '\\'")
+            params.append(_like_substring(search))
 
         where_clause = " AND ".join(where_parts)
 
@@ -342,6 +495,21 @@ class DatabaseManager:
             "pages": pages,
         }
 
+    def search_benchmarks(self, query: str, limit: int = 50) -> List[Dict]:
+        """Lightweight filename search (only the columns a picker needs)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, filename, family, difficulty, num_variables, num_clauses
+            FROM benchmarks
+            WHERE filename LIKE ? ESCAPE '\\'
+            ORDER BY filename
+            LIMIT ?
+        """, (_like_substring(query), limit))
+        results = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        return results
+
     def add_benchmark(self, filename: str, filepath: str,
                      family: str = None, size_bytes: int = None,
                      num_variables: int = None, num_clauses: int = None,
@@ -362,7 +530,7 @@ class DatabaseManager:
                   num_clauses, clause_variable_ratio, difficulty,
                   expected_result, tags, checksum))
             
-            conn.commit()
+            self._commit(conn)
             benchmark_id = cursor.lastrowid
             logger.info(f"Added benchmark: {filename} (ID: {benchmark_id})")
             return benchmark_id
@@ -374,8 +542,9 @@ class DatabaseManager:
             conn.close()
     
     def get_benchmarks(self, family: str = None, difficulty: str = None,
-                      limit: int = None) -> List[Dict]:
-        """Get benchmarks with optional filters"""
+                      limit: int = None, offset: int = 0,
+                      search: str = None) -> List[Dict]:
+        """Get benchmarks with optional filters (LIMIT/OFFSET and filename search in SQL)"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
@@ -388,18 +557,53 @@ class DatabaseManager:
         if difficulty:
             query += " AND difficulty = ?"
             params.append(difficulty)
+        if search:
+            query += " AND filename LIKE ? ESCAPE '\\'"
+            params.append(_like_substring(search))
         
         query += " ORDER BY filename"
         
-        if limit:
-            query += " LIMIT ?"
-            params.append(limit)
+        if limit or offset:
+            # LIMIT -1 = sin límite (SQLite exige LIMIT para usar OFFSET)
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit or -1, max(0, offset or 0)])
         
         cursor.execute(query, params)
         benchmarks = [dict(row) for row in cursor.fetchall()]
         conn.close()
         return benchmarks
     
+    def get_benchmark_filenames(self) -> set:
+        """Set of registered filenames (UNIQUE column, index-only scan)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT filename FROM benchmarks")
+        filenames = {row[0] for row in cursor.fetchall()}
+        conn.close()
+        return filenames
+    
+    def get_benchmark_difficulty_inputs(self) -> List[tuple]:
+        """(id, num_variables, clause_variable_ratio, difficulty) for every benchmark"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, num_variables, clause_variable_ratio, difficulty
+            FROM benchmarks ORDER BY id
+        """)
+        rows = [tuple(row) for row in cursor.fetchall()]
+        conn.close()
+        return rows
+    
+    def update_benchmark_difficulties(self, updates: List[tuple]) -> int:
+        """Apply (difficulty, id) pairs in one executemany/transaction"""
+        conn = self.get_connection()
+        try:
+            conn.executemany("UPDATE benchmarks SET difficulty = ? WHERE id = ?", updates)
+            self._commit(conn)
+        finally:
+            conn.close()
+        return len(updates)
+    
     def get_benchmark(self, benchmark_id: int) -> Optional[Dict]:
         """Get a single benchmark by ID"""
         conn = self.get_connection()
@@ -410,7 +614,11 @@ class DatabaseManager:
         return dict(row) if row else None
     
     def get_benchmark_families(self) -> List[Dict]:
-        """Get unique families with counts"""
+        """Get unique families with counts (cached until the data version changes)"""
+        return self._cached_read('benchmark_families', self._query_benchmark_families)
+    
+    def _query_benchmark_families(self) -> List[Dict]:
+        """Unique families with counts (uncached)"""
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute("""
@@ -425,16 +633,285 @@ class DatabaseManager:
         conn.close()
         return families
     
+    def get_benchmark_ids_by(self, column: str, values: List[str],
+                             chunk_size: int = 500) -> List[int]:
+        """
+        IDs (ascending) of benchmarks whose family/difficulty is in values (SQL IN,
+        no rows materialized). A NULL family/difficulty counts as 'unknown', as
+        in the stats and cleanup report.
+        """
+        if column not in ('family', 'difficulty'):
+            raise ValueError(f"Unsupported filter column: {column}")
+        values = list(dict.fromkeys(values))
+        ids: List[int] = []
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        for start in range(0, len(values), chunk_size):
+            chunk = values[start:start + chunk_size]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f"SELECT id FROM benchmarks WHERE {column} IN ({placeholders})", chunk)
+            ids.extend(row[0] for row in cursor.fetchall())
+        if 'unknown' in values:
+            cursor.execute(f"SELECT id FROM benchmarks WHERE {column} IS NULL")
+            ids.extend(row[0] for row in cursor.fetchall())
+        conn.close()
+        return sorted(set(ids))
+    
+    def get_existing_benchmark_ids(self, benchmark_ids: List[int],
+                                   chunk_size: int = 500) -> set:
+        """Subset of benchmark_ids present in the table (one IN query per chunk)"""
+        ids = list(dict.fromkeys(benchmark_ids))
+        existing = set()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f"SELECT id FROM benchmarks WHERE id IN ({placeholders})", chunk)
+            existing.update(row[0] for row in cursor.fetchall())
+        conn.close()
+        return existing
+    
+    def get_benchmarks_by_ids(self, benchmark_ids: List[int],
+                              chunk_size: int = 500) -> Dict[int, Dict]:
+        """{id: benchmark} for the given IDs (one IN query per chunk)"""
+        ids = list(dict.fromkeys(benchmark_ids))
+        benchmarks: Dict[int, Dict] = {}
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f"SELECT * FROM benchmarks WHERE id IN ({placeholders})", chunk)
+            benchmarks.update((row['id'], dict(row)) for row in cursor.fetchall())
+        conn.close()
+        return benchmarks
+    
+    def find_invalid_benchmarks(self) -> List[Dict]:
+        """Benchmarks with unknown family/difficulty or missing header data (cached)"""
+        return self._cached_read('invalid_benchmarks', self._query_invalid_benchmarks)
+    
+    def _query_invalid_benchmarks(self) -> List[Dict]:
+        """Invalid benchmarks (uncached)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, filename, filepath,
+                   COALESCE(family, 'unknown') as family,
+                   COALESCE(difficulty, 'unknown') as difficulty,
+                   num_variables, num_clauses
+            FROM benchmarks
+            WHERE family IS NULL OR family = 'unknown'
+               OR difficulty IS NULL OR difficulty = 'unknown'
+               OR num_variables IS NULL OR num_clauses IS NULL
+            ORDER BY id
+        """)
+        invalid = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        return invalid
+    
+    def find_duplicate_benchmarks(self, limit: int = None, offset: int = 0,
+                                  details: bool = True) -> List[Dict]:
+        """
+        Groups of benchmarks sharing the same checksum (same CNF content).
+        
+        Duplicate checksums are found first with a GROUP BY over the checksum
+        index; only rows of those groups are then joined back. Per-group columns
+        are aggregated with json_group_array (ids, filenames, families, ...).
+        limit/offset page over groups. With details=False only checksum, count
+        and the first filename are returned (see get_duplicate_group()).
+        """
+        page = (limit if limit else -1, max(0, offset or 0))
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        if not details:
+            cursor.execute("""
+                SELECT d.checksum, d.count, d.first_id, b.filename
+                FROM (
+                    SELECT checksum, COUNT(*) as count, MIN(id) as first_id
+                    FROM benchmarks
+                    WHERE checksum IS NOT NULL
+                    GROUP BY checksum
+                    HAVING COUNT(*) > 1
+                    ORDER BY count DESC, checksum
+                    LIMIT ? OFFSET ?
+                ) d
+                JOIN benchmarks b ON b.id = d.first_id
+                ORDER BY d.count DESC, d.checksum
+            """, page)
+            groups = [dict(row) for row in cursor.fetchall()]
+            conn.close()
+            return groups
+        
+        cursor.execute("""
+            WITH dup AS (
+                SELECT checksum, COUNT(*) as count
+                FROM benchmarks
+                WHERE checksum IS NOT NULL
+                GROUP BY checksum
+                HAVING COUNT(*) > 1
+                ORDER BY count DESC, checksum
+                LIMIT ? OFFSET ?
+            )
+            SELECT d.checksum, d.count,
+                   json_group_array(b.id) as ids,
+                   json_group_array(b.filename) as filenames,
+                   json_group_array(b.family) as families,
+                   json_group_array(b.num_variables) as variables,
+                   json_group_array(b.num_clauses) as clauses
+            FROM dup d
+            JOIN benchmarks b ON b.checksum = d.checksum
+            GROUP BY d.checksum
+            ORDER BY d.count DESC, d.checksum
+        """, page)
+        list_columns = ('ids', 'filenames', 'families', 'variables', 'clauses')
+        duplicates = []
+        for row in cursor.fetchall():
+            dup = dict(row)
+            for col in list_columns:
+                dup[col] = json.loads(dup[col])
+            # Orden por id dentro del grupo (json_group_array sigue el orden de visita)
+            if dup['ids'] != sorted(dup['ids']):
+                order = sorted(range(len(dup['ids'])), key=dup['ids'].__getitem__)
+                for col in list_columns:
+                    dup[col] = [dup[col][i] for i in order]
+            duplicates.append(dup)
+        conn.close()
+        return duplicates
+    
+    def get_duplicate_group(self, checksum: str) -> List[Dict]:
+        """Benchmarks of one duplicate group (index seek on checksum)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, filename, filepath, family, difficulty,
+                   num_variables, num_clauses, size_bytes, created_at
+            FROM benchmarks
+            WHERE checksum = ?
+            ORDER BY id
+        """, (checksum,))
+        rows = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        return rows
+    
+    def count_duplicate_groups(self) -> int:
+        """Number of checksum groups with more than one benchmark"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT COUNT(*) FROM (
+                SELECT 1 FROM benchmarks WHERE checksum IS NOT NULL
+                GROUP BY checksum HAVING COUNT(*) > 1
+            )
+        """)
+        count = cursor.fetchone()[0]
+        conn.close()
+        return count
+    
+    def keep_best_duplicate(self, checksum: str) -> Dict:
+        """
+        Keep the most complete benchmark of a duplicate group (same checksum)
+        and delete the rest in one statement; rows referenced by runs are kept.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT id FROM benchmarks
+                WHERE checksum = ?
+                ORDER BY (num_variables IS NOT NULL) + (num_clauses IS NOT NULL)
+                       + (COALESCE(family, 'unknown') != 'unknown')
+                       + (COALESCE(difficulty, 'unknown') != 'unknown') DESC,
+                         id ASC
+                LIMIT 1
+            """, (checksum,))
+            row = cursor.fetchone()
+            if row is None:
+                return {"kept": None, "deleted": 0}
+            best_id = row[0]
+            cursor.execute("""
+                DELETE FROM benchmarks
+                WHERE checksum = ? AND id != ?
+                  AND id NOT IN (SELECT benchmark_id FROM runs WHERE benchmark_id IS NOT NULL)
+            """, (checksum, best_id))
+            deleted = cursor.rowcount
+            self._commit(conn)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return {"kept": best_id, "deleted": deleted}
+    
     def delete_benchmark(self, benchmark_id: int) -> bool:
         """Delete a benchmark"""
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute("DELETE FROM benchmarks WHERE id = ?", (benchmark_id,))
-        conn.commit()
+        self._commit(conn)
         success = cursor.rowcount > 0
         conn.close()
         return success
     
+    def delete_benchmarks_batch(self, benchmark_ids: List[int],
+                                chunk_size: int = 500) -> Dict:
+        """
+        Delete many benchmarks in a single transaction.
+        
+        Benchmarks that still have runs are skipped (found with one aggregate
+        query per chunk); IDs are chunked to stay under SQLite's parameter limit.
+        The removed IDs come back from DELETE ... RETURNING, so callers can
+        patch their cached lists instead of re-fetching everything.
+        """
+        ids = list(dict.fromkeys(benchmark_ids))
+        deleted_ids: List[int] = []
+        with_runs: List[int] = []
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            for start in range(0, len(ids), chunk_size):
+                chunk = ids[start:start + chunk_size]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(
+                    f"SELECT DISTINCT benchmark_id FROM runs WHERE benchmark_id IN ({placeholders})",
+                    chunk
+                )
+                has_runs = {row[0] for row in cursor.fetchall()}
+                with_runs.extend(i for i in chunk if i in has_runs)
+                
+                survivors = [i for i in chunk if i not in has_runs]
+                if survivors:
+                    placeholders = ','.join('?' * len(survivors))
+                    if SQLITE_HAS_RETURNING:
+                        cursor.execute(
+                            f"DELETE FROM benchmarks WHERE id IN ({placeholders}) RETURNING id",
+                            survivors
+                        )
+                        deleted_ids.extend(row[0] for row in cursor.fetchall())
+                    else:
+                        cursor.execute(
+                            f"SELECT id FROM benchmarks WHERE id IN ({placeholders})", survivors
+                        )
+                        deleted_ids.extend(row[0] for row in cursor.fetchall())
+                        cursor.execute(
+                            f"DELETE FROM benchmarks WHERE id IN ({placeholders})", survivors
+                        )
+            self._commit(conn)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        
+        return {
+            "requested": len(ids),
+            "deleted": len(deleted_ids),
+            "deleted_ids": deleted_ids,
+            "skipped_with_runs": with_runs,
+            "not_found": len(ids) - len(deleted_ids) - len(with_runs),
+        }
+    
     # ==================== EXPERIMENT OPERATIONS ====================
     
     def create_experiment(self, name: str, description: str = None,
@@ -449,16 +926,20 @@ class DatabaseManager:
                                     memory_limit_mb, parallel_jobs, metadata)
             VALUES (?, ?, ?, ?, ?, ?)
         """, (name, description, timeout_seconds, memory_limit_mb,
-              parallel_jobs, json.dumps(metadata) if metadata else None))
+              parallel_jobs, _json_dumps(metadata) if metadata else None))
         
-        conn.commit()
+        self._commit(conn)
         experiment_id = cursor.lastrowid
         conn.close()
         logger.info(f"Created experiment: {name} (ID: {experiment_id})")
         return experiment_id
     
     def get_experiments(self, status: str = None) -> List[Dict]:
-        """Get all experiments"""
+        """Get all experiments (cached until the data version changes)"""
+        return self._cached_read(f'experiments:{status or ""}', lambda: self._query_experiments(status))
+    
+    def _query_experiments(self, status: str = None) -> List[Dict]:
+        """Experiments, optionally filtered by status (uncached)"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
@@ -499,7 +980,7 @@ class DatabaseManager:
             if field in valid_fields:
                 updates.append(f"{field} = ?")
                 if field == 'metadata' and isinstance(value, dict):
-                    values.append(json.dumps(value))
+                    values.append(_json_dumps(value))
                 else:
                     values.append(value)
         
@@ -510,43 +991,152 @@ class DatabaseManager:
         query = f"UPDATE experiments SET {', '.join(updates)} WHERE id = ?"
         
         cursor.execute(query, values)
-        conn.commit()
+        self._commit(conn)
         success = cursor.rowcount > 0
         conn.close()
         return success
     
+    def get_experiment_delete_preview(self, experiment_ids: List[int],
+                                      chunk_size: int = 500) -> Dict:
+        """
+        Aggregates shown before a bulk delete (count, runs, completed, status
+        counts). The UI asks again while the ID list is being edited, so results
+        are memoized per ID set until the data version changes.
+        """
+        ids = tuple(dict.fromkeys(experiment_ids))
+        # La versión va en la clave: tras una escritura las entradas viejas no
+        # vuelven a coincidir y el LRU las va desalojando
+        key = (self.get_data_version(), ids)
+        preview = self._delete_previews.get(key)
+        if preview is None:
+            preview = self._query_experiment_delete_preview(ids, chunk_size)
+            self._delete_previews[key] = preview
+            while len(self._delete_previews) > DELETE_PREVIEW_CACHE_MAX:
+                self._delete_previews.popitem(last=False)
+        else:
+            self._delete_previews.move_to_end(key)
+        return {**preview, "status_counts": dict(preview["status_counts"])}
+    
+    def _query_experiment_delete_preview(self, ids: tuple, chunk_size: int) -> Dict:
+        """Delete preview with one GROUP BY status query per ID chunk (uncached)"""
+        status_counts: Dict[str, int] = {}
+        preview = {"experiments": 0, "total_runs": 0, "completed_runs": 0}
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f"""
+                SELECT status, COUNT(*) as n,
+                       COALESCE(SUM(total_runs), 0) as total_runs,
+                       COALESCE(SUM(completed_runs), 0) as completed_runs
+                FROM experiments
+                WHERE id IN ({placeholders})
+                GROUP BY status
+            """, chunk)
+            for row in cursor.fetchall():
+                status = row['status'] or 'unknown'
+                status_counts[status] = status_counts.get(status, 0) + row['n']
+                preview["experiments"] += row['n']
+                preview["total_runs"] += row['total_runs']
+                preview["completed_runs"] += row['completed_runs']
+        conn.close()
+        
+        preview["status_counts"] = status_counts
+        preview["not_found"] = len(ids) - preview["experiments"]
+        return preview
+    
     def delete_experiment(self, experiment_id: int) -> bool:
         """Delete an experiment and its runs"""
+        return self.delete_experiments([experiment_id])["deleted"] > 0
+    
+    def delete_experiments(self, experiment_ids: List[int], chunk_size: int = 500) -> Dict:
+        """
+        Delete many experiments and their runs in a single transaction.
+        
+        Runs are removed explicitly (foreign keys are not enforced, so there is
+        no cascade); IDs are chunked to stay under SQLite's parameter limit.
+        """
+        ids = list(dict.fromkeys(experiment_ids))
+        deleted = 0
+        runs_deleted = 0
+        
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM experiments WHERE id = ?", (experiment_id,))
-        conn.commit()
-        success = cursor.rowcount > 0
-        conn.close()
-        return success
+        try:
+            for start in range(0, len(ids), chunk_size):
+                chunk = ids[start:start + chunk_size]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f"DELETE FROM runs WHERE experiment_id IN ({placeholders})", chunk)
+                runs_deleted += cursor.rowcount
+                cursor.execute(f"DELETE FROM experiments WHERE id IN ({placeholders})", chunk)
+                deleted += cursor.rowcount
+            self._commit(conn)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        
+        return {
+            "requested": len(ids),
+            "deleted": deleted,
+            "runs_deleted": runs_deleted,
+            "not_found": len(ids) - deleted,
+        }
     
     # ==================== RUN OPERATIONS ====================
     
     def add_run(self, experiment_id: int, solver_id: int, benchmark_id: int,
                 result: str = None, **kwargs) -> int:
         """Add a run result.  Extra/unknown fields are captured in extra_stats_json."""
+        columns, values = self._run_insert_row(experiment_id, solver_id, benchmark_id,
+                                               result, **kwargs)
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        cursor.execute(_run_insert_sql(tuple(columns)), values)
+        self._commit(conn)
+        run_id = cursor.lastrowid
+        conn.close()
+        return run_id
+    
+    def add_runs_bulk(self, runs: List[Dict], chunk_size: int = 10000) -> int:
+        """
+        Insert many runs (same keyword fields as add_run) in one transaction.
+        Rows are grouped by column set and written with executemany per chunk.
+        """
+        groups: Dict[tuple, List[list]] = {}
+        for run in runs:
+            columns, values = self._run_insert_row(**run)
+            groups.setdefault(tuple(columns), []).append(values)
+        
+        conn = self.get_connection()
+        try:
+            for columns, rows in groups.items():
+                query = _run_insert_sql(columns)
+                for start in range(0, len(rows), chunk_size):
+                    conn.executemany(query, rows[start:start + chunk_size])
+            self._commit(conn)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return len(runs)
+    
+    @staticmethod
+    def _run_insert_row(experiment_id: int, solver_id: int, benchmark_id: int,
+                        result: str = None, **kwargs) -> tuple:
+        """(columns, values) for one runs INSERT; unknown fields go to extra_stats_json"""
         columns = ['experiment_id', 'solver_id', 'benchmark_id', 'result']
         values = [experiment_id, solver_id, benchmark_id, result]
         
-        valid_fields = ['exit_code', 'verified', 'cpu_time_seconds', 'wall_time_seconds',
-                       'user_time_seconds', 'system_time_seconds', 'max_memory_kb',
-                       'avg_memory_kb', 'conflicts', 'decisions', 'propagations',
-                       'restarts', 'learnt_clauses', 'deleted_clauses', 'hostname',
-                       'solver_output', 'error_message', 'par2_score',
-                       'extra_stats_json']
-        
         # Collect overflow fields into extra_stats_json
         overflow: Dict[str, Any] = {}
         for field, value in kwargs.items():
-            if field in valid_fields:
+            if field in RUN_FIELDS:
                 columns.append(field)
                 values.append(value)
             elif field not in ('solver_name',):  # skip known non-DB fields
@@ -555,20 +1145,18 @@ class DatabaseManager:
         # If there are overflow stats and no explicit extra_stats_json was provided
         if overflow and 'extra_stats_json' not in columns:
             columns.append('extra_stats_json')
-            values.append(json.dumps(overflow, default=str))
-        
-        placeholders = ', '.join(['?' for _ in columns])
-        query = f"INSERT OR REPLACE INTO runs ({', '.join(columns)}) VALUES ({placeholders})"
+            values.append(_json_dumps(overflow, default=str))
         
-        cursor.execute(query, values)
-        conn.commit()
-        run_id = cursor.lastrowid
-        conn.close()
-        return run_id
+        return columns, values
     
     def get_runs(self, experiment_id: int = None, solver_id: int = None,
-                benchmark_id: int = None) -> List[Dict]:
-        """Get runs with optional filters"""
+                benchmark_id: int = None, limit: int = None,
+                offset: int = 0, after_id: int = None) -> List[Dict]:
+        """
+        Get runs with optional filters (limit/offset page in SQL). With after_id,
+        keyset paging instead: runs with id > after_id in id order, so inserts
+        made while paging neither shift nor repeat rows.
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
         
@@ -597,7 +1185,15 @@ class DatabaseManager:
             query += " AND r.benchmark_id = ?"
             params.append(benchmark_id)
         
-        query += " ORDER BY r.timestamp DESC"
+        if after_id is not None:
+            query += " AND r.id > ? ORDER BY r.id"
+            params.append(after_id)
+        else:
+            query += " ORDER BY r.timestamp DESC, r.id DESC"  # id: orden estable para paginar
+        
+        if limit or offset:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit or -1, max(0, offset or 0)])
         
         cursor.execute(query, params)
         runs = [dict(row) for row in cursor.fetchall()]
@@ -621,9 +1217,36 @@ class DatabaseManager:
         
         return runs
     
+    def count_runs(self, experiment_id: int = None) -> int:
+        """Number of runs (optionally of one experiment)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        if experiment_id:
+            cursor.execute("SELECT COUNT(*) FROM runs WHERE experiment_id = ?", (experiment_id,))
+        else:
+            cursor.execute("SELECT COUNT(*) FROM runs")
+        count = cursor.fetchone()[0]
+        conn.close()
+        return count
+    
+    def get_result_distribution(self, experiment_id: int) -> Dict[str, int]:
+        """{result: count} for one experiment, most recently seen result first"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT result, COUNT(*) as n
+            FROM runs
+            WHERE experiment_id = ?
+            GROUP BY result
+            ORDER BY MAX(timestamp) DESC, MAX(id) DESC
+        """, (experiment_id,))
+        distribution = {row['result']: row['n'] for row in cursor.fetchall()}
+        conn.close()
+        return distribution
+    
     def get_all_runs(self) -> List[Dict]:
-        """Get all runs with details"""
-        return self.get_runs()
+        """Get all runs with details (cached until the data version changes)"""
+        return self._cached_read('all_runs', self.get_runs)
     
     # ==================== STATISTICS ====================
     
@@ -634,39 +1257,27 @@ class DatabaseManager:
         
         stats = {}
         
-        # Counts
-        cursor.execute("SELECT COUNT(*) FROM solvers")
-        stats['total_solvers'] = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM solvers WHERE status = 'ready'")
-        stats['ready_solvers'] = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM benchmarks")
-        stats['total_benchmarks'] = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM experiments")
-        stats['total_experiments'] = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM experiments WHERE status = 'completed'")
-        stats['completed_experiments'] = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM experiments WHERE status = 'running'")
-        stats['running_experiments'] = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM runs")
-        stats['total_runs'] = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM runs WHERE result = 'SAT'")
-        stats['sat_results'] = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM runs WHERE result = 'UNSAT'")
-        stats['unsat_results'] = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM runs WHERE result = 'TIMEOUT'")
-        stats['timeout_results'] = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM runs WHERE result = 'ERROR'")
-        stats['error_results'] = cursor.fetchone()[0]
+        # Todos los contadores en una sola consulta (un parse/plan, un escaneo por tabla)
+        cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM solvers) as total_solvers,
+                (SELECT COUNT(*) FROM solvers WHERE status = 'ready') as ready_solvers,
+                (SELECT COUNT(*) FROM benchmarks) as total_benchmarks,
+                e.total_experiments, e.completed_experiments, e.running_experiments,
+                r.total_runs, r.sat_results, r.unsat_results, r.timeout_results, r.error_results
+            FROM
+                (SELECT COUNT(*) as total_experiments,
+                        COALESCE(SUM(status = 'completed'), 0) as completed_experiments,
+                        COALESCE(SUM(status = 'running'), 0) as running_experiments
+                 FROM experiments) e,
+                (SELECT COUNT(*) as total_runs,
+                        COALESCE(SUM(result = 'SAT'), 0) as sat_results,
+                        COALESCE(SUM(result = 'UNSAT'), 0) as unsat_results,
+                        COALESCE(SUM(result = 'TIMEOUT'), 0) as timeout_results,
+                        COALESCE(SUM(result = 'ERROR'), 0) as error_results
+                 FROM runs) r
+        """)
+        stats.update(dict(cursor.fetchone()))
         
         # Recent activity
         cursor.execute("""
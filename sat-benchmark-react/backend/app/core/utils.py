@@ -0,0 +1,45 @@
+"""
+Shared helpers for the API layer
+"""
+
+import re
+from typing import List
+
+import numpy as np
+
+# Un token es "N" o "N-M"; cualquier otro carácter que no sea coma/espacio es un error
+_ID_TOKEN_RE = re.compile(r'(\d+)(?:\s*-\s*(\d+))?|([^\s,])')
+
+# Tope de IDs por spec: '1-99999999999' no debe poder reservar cientos de GB
+MAX_ID_SPEC_SIZE = 100_000
+# IDs de SQLite son int64 y np.arange necesita que last + 1 quepa en int64
+_MAX_ID = 2 ** 63 - 2
+
+
+def parse_id_ranges(spec: str, max_ids: int = MAX_ID_SPEC_SIZE) -> List[int]:
+    """
+    Parse an ID spec like '1-5, 9, 20-22' into sorted unique IDs.
+
+    Tokens come from one compiled regex and ranges are expanded with np.arange;
+    raises ValueError on anything that is not a number, range, comma or space,
+    on reversed ranges ('9-1'), IDs beyond int64 and when the spec would expand past max_ids.
+    """
+    pieces = []
+    total = 0
+    for start, end, junk in _ID_TOKEN_RE.findall(spec):
+        if junk:
+            raise ValueError(f"Invalid ID spec: {spec!r}")
+        first = int(start)
+        last = int(end) if end else first
+        if last < first:
+            raise ValueError(f"Reversed ID range: {start}-{end}")
+        if last > _MAX_ID:
+            raise ValueError(f"ID out of range: {last}")
+        # Se comprueba antes de reservar memoria para el rango
+        total += last - first + 1
+        if total > max_ids:
+            raise ValueError(f"ID spec expands to more than {max_ids} IDs")
+        pieces.append(np.arange(first, last + 1, dtype=np.int64))
+    if not pieces:
+        return []
+    return np.unique(np.concatenate(pieces)).tolist()
@@ -27,6 +27,24 @@ from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Patrones de parse_stats compilados una vez (se aplican a la salida de cada run)
+_STAT_PATTERNS = {
+    key: re.compile(pat, re.IGNORECASE)
+    for key, pat in {
+        "conflicts": r"conflicts\s*[:\s]+(\d+)",
+        "decisions": r"decisions\s*[:\s]+(\d+)",
+        "propagations": r"propagations\s*[:\s]+(\d+)",
+        "restarts": r"restarts\s*[:\s]+(\d+)",
+        "learnt_clauses": r"(?:learnt|learned)\s*(?:clauses|literals)?\s*[:\s]+(\d+)",
+        "deleted_clauses": r"(?:deleted|removed)\s*(?:clauses)?\s*[:\s]+(\d+)",
+    }.items()
+}
+_CPU_TIME_RE = re.compile(r"(?:CPU|process)[- ]time[:\s]+(\d+\.?\d*)\s*(?:s|seconds)", re.IGNORECASE)
+_MAX_RSS_BYTES_RE = re.compile(r"maximum-resident-set-size:\s+(\d+)\s*bytes", re.IGNORECASE)
+_MEMORY_MB_RE = re.compile(r"(?:Memory used|Mem used|memory)\s*[:\s]+([\d.]+)\s*MB", re.IGNORECASE)
+_VERSION_RE = re.compile(r"(\d+\.\d+(?:\.\d+)?)")
+_LEADING_INT_RE = re.compile(r'(\d+)')
+
 
 # ────────────────────────────────────────────────────────
 # Data classes
@@ -263,7 +281,7 @@ class SolverPlugin(ABC):
         Parse version from command output.  Override for solvers
         with non-standard version output.
         """
-        m = re.search(r"(\d+\.\d+(?:\.\d+)?)", output)
+        m = _VERSION_RE.search(output)
         return m.group(1) if m else None
 
     def detect_version(self) -> str:
@@ -527,7 +545,7 @@ class SolverPlugin(ABC):
                         except (ValueError, IndexError):
                             pass
                     elif "percent of cpu" in key_lower:
-                        m = re.search(r'(\d+)', value)
+                        m = _LEADING_INT_RE.search(value)
                         if m:
                             stats["percent_cpu"] = int(m.group(1))
                     elif "exit status" in key_lower:
@@ -564,16 +582,8 @@ class SolverPlugin(ABC):
         across all CDCL solvers.
         """
         stats: Dict[str, Any] = {}
-        patterns = {
-            "conflicts": r"conflicts\s*[:\s]+(\d+)",
-            "decisions": r"decisions\s*[:\s]+(\d+)",
-            "propagations": r"propagations\s*[:\s]+(\d+)",
-            "restarts": r"restarts\s*[:\s]+(\d+)",
-            "learnt_clauses": r"(?:learnt|learned)\s*(?:clauses|literals)?\s*[:\s]+(\d+)",
-            "deleted_clauses": r"(?:deleted|removed)\s*(?:clauses)?\s*[:\s]+(\d+)",
-        }
-        for key, pat in patterns.items():
-            m = re.search(pat, output, re.IGNORECASE)
+        for key, pattern in _STAT_PATTERNS.items():
+            m = pattern.search(output)
             if m:
                 try:
                     stats[key] = int(m.group(1))
@@ -581,18 +591,18 @@ class SolverPlugin(ABC):
                     pass
 
         # CPU time (solver-reported)
-        m = re.search(r"(?:CPU|process)[- ]time[:\s]+(\d+\.?\d*)\s*(?:s|seconds)", output, re.IGNORECASE)
+        m = _CPU_TIME_RE.search(output)
         if m:
             stats["cpu_time_seconds"] = float(m.group(1))
 
         # Memory: bytes → KB
-        m = re.search(r"maximum-resident-set-size:\s+(\d+)\s*bytes", output, re.IGNORECASE)
+        m = _MAX_RSS_BYTES_RE.search(output)
         if m:
             stats["max_memory_kb"] = int(m.group(1)) // 1024
 
         # Memory: MB → KB
         if "max_memory_kb" not in stats:
-            m = re.search(r"(?:Memory used|Mem used|memory)\s*[:\s]+([\d.]+)\s*MB", output, re.IGNORECASE)
+            m = _MEMORY_MB_RE.search(output)
             if m:
                 stats["max_memory_kb"] = int(float(m.group(1)) * 1024)
 
@@ -659,10 +669,6 @@ class SolverPlugin(ABC):
         Check which system packages/commands are available.
         Returns (all_found, list_of_missing).
         """
-        missing = []
-        for pkg in packages:
-            if subprocess.run(
-                ["which", pkg], capture_output=True
-            ).returncode != 0:
-                missing.append(pkg)
+        # shutil.which busca en PATH sin lanzar un proceso `which` por paquete
+        missing = [pkg for pkg in packages if shutil.which(pkg) is None]
         return len(missing) == 0, missing
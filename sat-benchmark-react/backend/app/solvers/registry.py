@@ -14,7 +14,6 @@ from __future__ import annotations
 
 import importlib
 import logging
-import os
 import pkgutil
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -17,6 +17,7 @@ import {
 } from 'lucide-react';
 import toast from 'react-hot-toast';
 import { benchmarksApi } from '@/services/api';
+import { formatNumber } from '@/utils/format';
 import type { Benchmark, BenchmarkFamily } from '@/types';
 import LoadingSpinner from '@/components/common/LoadingSpinner';
 import Badge from '@/components/common/Badge';
@@ -154,6 +155,9 @@ export default function Benchmarks() {
         </div>
       )}
 
+      {/* Data quality: percentages come precomputed from /benchmarks/stats */}
+      {stats?.quality && stats.total > 0 && <QualityBars rows={stats.quality} />}
+
       {/* Filters */}
       <div className="flex flex-col sm:flex-row gap-4">
         <div className="relative flex-1">
@@ -260,10 +264,10 @@ export default function Benchmarks() {
                       <Badge variant="info">{benchmark.family}</Badge>
                     </td>
                     <td className="font-mono text-sm">
-                      {benchmark.num_variables?.toLocaleString() || '-'}
+                      {formatNumber(benchmark.num_variables) || '-'}
                     </td>
                     <td className="font-mono text-sm">
-                      {benchmark.num_clauses?.toLocaleString() || '-'}
+                      {formatNumber(benchmark.num_clauses) || '-'}
                     </td>
                     <td className="font-mono text-sm">
                       {benchmark.clause_variable_ratio?.toFixed(2) || '-'}
@@ -391,6 +395,34 @@ function StatCard({ label, value, color }: { label: string; value: number | stri
   );
 }
 
+interface QualityRow {
+  field: string;
+  complete: number;
+  incomplete: number;
+  percent_complete: number;
+}
+
+function QualityBars({ rows }: { rows: QualityRow[] }) {
+  return (
+    <div className="card">
+      <div className="card-body space-y-2">
+        <p className="text-sm font-medium text-gray-300">Calidad de metadatos</p>
+        {rows.map((row) => (
+          <div key={row.field} className="flex items-center gap-3 text-sm">
+            <span className="w-32 text-gray-400">{row.field}</span>
+            <div className="flex-1 h-2 rounded bg-gray-700/50 overflow-hidden">
+              <div className="h-full bg-green-500/70" style={{ width: `${row.percent_complete}%` }} />
+            </div>
+            <span className="w-28 text-right text-gray-400">
+              {row.percent_complete.toFixed(1)}% ({row.incomplete} inc.)
+            </span>
+          </div>
+        ))}
+      </div>
+    </div>
+  );
+}
+
 function DifficultyBadge({ difficulty }: { difficulty: string }) {
   const variants: Record<string, 'success' | 'warning' | 'error' | 'gray'> = {
     easy: 'success',
@@ -15,6 +15,7 @@ import {
 } from 'lucide-react';
 import toast from 'react-hot-toast';
 import { experimentsApi, solversApi, benchmarksApi } from '@/services/api';
+import { formatNumber } from '@/utils/format';
 import type { Experiment, ExperimentCreate } from '@/types';
 import LoadingSpinner from '@/components/common/LoadingSpinner';
 import { StatusBadge } from '@/components/common/Badge';
@@ -35,8 +36,11 @@ export default function Experiments() {
   // Mutations
   const deleteMutation = useMutation({
     mutationFn: (id: number) => experimentsApi.delete(id),
-    onSuccess: () => {
-      queryClient.invalidateQueries({ queryKey: ['experiments'] });
+    onSuccess: (_, id) => {
+      // Quitar de la caché en lugar de volver a pedir toda la lista
+      queryClient.setQueryData<Experiment[]>(['experiments'], (old) =>
+        old?.filter((e) => e.id !== id)
+      );
       toast.success('Experimento eliminado');
     },
   });
@@ -335,9 +339,9 @@ function CreateExperimentForm({ onSuccess }: { onSuccess: () => void }) {
     createMutation.mutate(formData);
   };
 
-  const selectAllBenchmarksByFamily = (family: string) => {
-    const familyBenchmarks = benchmarks?.filter(b => b.family === family) || [];
-    const ids = familyBenchmarks.map(b => b.id);
+  const selectAllBenchmarksByFamily = async (family: string) => {
+    // IDs resueltos en el servidor: no depende de haber cargado toda la lista
+    const ids = await benchmarksApi.getIds([family]);
     setFormData(prev => ({
       ...prev,
       benchmark_ids: [...new Set([...prev.benchmark_ids, ...ids])]
@@ -550,7 +554,7 @@ function CreateExperimentForm({ onSuccess }: { onSuccess: () => void }) {
                     </td>
                     <td className="p-2 truncate max-w-xs">{benchmark.filename}</td>
                     <td className="p-2">{benchmark.family}</td>
-                    <td className="p-2">{benchmark.num_variables?.toLocaleString()}</td>
+                    <td className="p-2">{formatNumber(benchmark.num_variables)}</td>
                   </tr>
                 ))}
               </tbody>
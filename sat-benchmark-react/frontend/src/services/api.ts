@@ -103,6 +103,14 @@ export const benchmarksApi = {
     return data;
   },
   
+  getIds: async (families: string[] = [], difficulties: string[] = []): Promise<number[]> => {
+    const params = new URLSearchParams();
+    families.forEach((f) => params.append('family', f));
+    difficulties.forEach((d) => params.append('difficulty', d));
+    const { data } = await api.get(`/benchmarks/ids?${params}`);
+    return data;
+  },
+
   getById: async (id: number): Promise<Benchmark> => {
     const { data } = await api.get(`/benchmarks/${id}`);
     return data;
@@ -174,7 +182,7 @@ export const experimentsApi = {
     const { data } = await api.delete(`/experiments/${id}`);
     return data;
   },
-  
+
   start: async (id: number) => {
     const { data } = await api.post(`/experiments/${id}/start`);
     return data;
@@ -190,8 +198,9 @@ export const experimentsApi = {
     return data;
   },
   
-  getRuns: async (id: number): Promise<Run[]> => {
-    const { data } = await api.get(`/experiments/${id}/runs`);
+  getRuns: async (id: number, limit?: number, offset = 0): Promise<Run[]> => {
+    const params = limit ? { limit, offset } : {};
+    const { data } = await api.get(`/experiments/${id}/runs`, { params });
     return data;
   },
 };
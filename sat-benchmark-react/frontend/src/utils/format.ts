@@ -0,0 +1,6 @@
+// Un único Intl.NumberFormat compartido: toLocaleString() crea uno nuevo en cada llamada
+const numberFormat = new Intl.NumberFormat();
+
+export function formatNumber(value?: number | null): string | undefined {
+  return value == null ? undefined : numberFormat.format(value);
+}